@@ -1,6 +1,7 @@
 """CLI entry point for hyperclaude."""
 
 import click
+import os
 import sys
 from pathlib import Path
 
@@ -11,7 +12,7 @@ from .config import (
 )
 from .launcher import (
     start_swarm, stop_swarm, get_swarm_status, is_swarm_running,
-    send_to_manager, is_any_swarm_running,
+    send_to_manager, is_any_swarm_running, get_session_set,
 )
 
 
@@ -151,11 +152,12 @@ def sessions():
     click.echo("hyperclaude Sessions")
     click.echo("=" * 60)
 
+    running_sessions = get_session_set()
     for sess in sessions_list:
         name = sess.get("name", "unknown")
         workspace = sess.get("workspace", "?")
         num_workers = sess.get("num_workers", "?")
-        running = is_swarm_running(name)
+        running = is_swarm_running(name, running_sessions)
 
         status_str = "running" if running else "stopped"
         active_marker = " (active)" if name == active else ""
@@ -426,7 +428,7 @@ def send(ctx, target, message, protocol_name, wait, timeout, session_name):
     # Build worker preamble with clear instructions
     preamble = _build_worker_preamble(worker_id, proto, current_phase, message)
 
-    send_to_worker(worker_id, preamble, session)
+    send_to_worker(worker_id, preamble, session, state="working")
     click.echo(f"Task sent to worker {worker_id} (protocol: {proto})")
 
     # If --wait flag, block until worker signals done
@@ -475,7 +477,7 @@ def broadcast(ctx, task, protocol_name, wait, timeout, session_name):
         click.echo("Error: Task cannot be empty.")
         return
 
-    from .launcher import send_to_worker
+    from .launcher import send_to_worker, get_session_snapshot
     from .protocols import (
         get_active_protocol, set_worker_state, get_phase,
         set_active_protocol, await_trigger as do_await, get_worker_state,
@@ -502,6 +504,9 @@ def broadcast(ctx, task, protocol_name, wait, timeout, session_name):
     # Clear any stale triggers before sending
     clear_all_triggers(session)
 
+    # Resolve pane targets once for the whole broadcast
+    snapshot = get_session_snapshot(session)
+
     # Stagger sends to avoid overwhelming tmux with many workers
     # 50ms delay between workers = 1.25s total for 25 workers
     import time
@@ -511,7 +516,7 @@ def broadcast(ctx, task, protocol_name, wait, timeout, session_name):
 
         # Build worker preamble with clear instructions
         preamble = _build_worker_preamble(i, proto, current_phase, task)
-        send_to_worker(i, preamble, session)
+        send_to_worker(i, preamble, session, snapshot, state="working")
 
         # Small delay between workers to prevent tmux command pile-up
         if i < num_workers - 1:
@@ -704,6 +709,12 @@ FILES: {', '.join(files) if files else 'N/A'}
     create_trigger(f"worker-{worker}-done", session)
     click.echo(f"Worker {worker} marked as {done_status}")
 
+    # Flag our own pane as idle so status checks can skip scanning it
+    own_pane = os.environ.get("TMUX_PANE")
+    if own_pane:
+        from .launcher import set_pane_state
+        set_pane_state(own_pane, "idle")
+
     # Check if all workers are done
     if check_all_workers_done(session):
         click.echo("All workers done - 'all-done' trigger created")
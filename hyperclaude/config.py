@@ -3,6 +3,7 @@
 import json
 import os
 import re
+import threading
 from pathlib import Path
 from typing import Any
 
@@ -62,6 +63,41 @@ def validate_lock_paths(files: tuple[str, ...] | list[str]) -> list[str]:
     return validated
 
 
+# =============================================================================
+# File Writes
+# =============================================================================
+
+def atomic_write_bytes(path: Path, data: bytes) -> os.stat_result:
+    """Replace a file's contents atomically.
+
+    Writes a temp file beside it and renames it over the original, so
+    readers see either the old or the new contents, never a partial write.
+    The temp name is unique per process and thread, so concurrent writers
+    don't clobber each other's temp file. Returns the stat of the file
+    written, taken before the rename so it can't describe a file another
+    writer put there afterwards.
+    """
+    tmp = path.with_name(f"{path.name}.tmp.{os.getpid()}.{threading.get_ident()}")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        try:
+            os.write(fd, data)
+            stat = os.fstat(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+    except BaseException:
+        # Don't leave the temp file behind when the write or rename fails
+        tmp.unlink(missing_ok=True)
+        raise
+    return stat
+
+
+def atomic_write_text(path: Path, data: str) -> None:
+    """Replace a text file's contents atomically (see atomic_write_bytes)."""
+    atomic_write_bytes(path, data.encode())
+
+
 # Default configuration
 DEFAULT_CONFIG = {
     "default_workers": 6,
@@ -93,6 +129,7 @@ def ensure_directories() -> dict[str, Path]:
         "protocols": base / "protocols",
         "triggers": base / "triggers",
         "sessions": base / "sessions",
+        "fifo": base / "fifo",
     }
 
     for path in dirs.values():
@@ -115,8 +152,17 @@ def get_session_dir(name: str) -> Path:
     return get_sessions_dir() / name
 
 
+# Sessions whose directories this process has created, with the session
+# directory's inode at the time; cleared by unregister_session
+_ensured_sessions: dict[str, int] = {}
+
+
 def ensure_session_directories(name: str) -> dict[str, Path]:
-    """Create all directories for a session. Returns dict of paths."""
+    """Create all directories for a session. Returns dict of paths.
+
+    After the first call for a session only the session directory is
+    stat'ed, to notice it being removed or recreated by another process.
+    """
     session_dir = get_session_dir(name)
 
     dirs = {
@@ -128,8 +174,16 @@ def ensure_session_directories(name: str) -> dict[str, Path]:
         "locks": session_dir / "locks",
     }
 
+    try:
+        ino = os.stat(session_dir).st_ino
+    except FileNotFoundError:
+        ino = None
+    if ino is not None and _ensured_sessions.get(name) == ino:
+        return dirs
+
     for path in dirs.values():
         path.mkdir(parents=True, exist_ok=True)
+    _ensured_sessions[name] = os.stat(session_dir).st_ino
 
     return dirs
 
@@ -157,6 +211,7 @@ def unregister_session(name: str) -> None:
     """Remove a session registration."""
     import shutil
     session_dir = get_session_dir(name)
+    _ensured_sessions.pop(name, None)
     if session_dir.exists():
         shutil.rmtree(session_dir)
 
@@ -267,6 +322,11 @@ def get_triggers_dir() -> Path:
     return get_hyperclaude_dir() / "triggers"
 
 
+def get_fifo_dir() -> Path:
+    """Get the directory for pane output FIFOs."""
+    return get_hyperclaude_dir() / "fifo"
+
+
 def get_worker_state_dir() -> Path:
     """Get the worker state directory (for JSON state files)."""
     return get_hyperclaude_dir() / "state" / "workers"
@@ -277,17 +337,33 @@ def get_config_path() -> Path:
     return get_hyperclaude_dir() / "config.yaml"
 
 
+# Merged config from the last parse, keyed by the config file's (mtime, size)
+_config_cache: dict[Path, tuple[tuple[int, int], dict[str, Any]]] = {}
+
+
 def load_config() -> dict[str, Any]:
-    """Load configuration from file, creating defaults if needed."""
+    """Load configuration from file, creating defaults if needed.
+
+    The parsed file is cached until its mtime or size changes, so repeated
+    calls don't re-parse the YAML. Each call returns its own copy.
+    """
     config_path = get_config_path()
 
-    if config_path.exists():
+    try:
+        st = config_path.stat()
+    except FileNotFoundError:
+        return DEFAULT_CONFIG.copy()
+
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _config_cache.get(config_path)
+    if cached is None or cached[0] != key:
         with open(config_path) as f:
             user_config = yaml.safe_load(f) or {}
         # Merge with defaults
-        return {**DEFAULT_CONFIG, **user_config}
+        cached = (key, {**DEFAULT_CONFIG, **user_config})
+        _config_cache[config_path] = cached
 
-    return DEFAULT_CONFIG.copy()
+    return dict(cached[1])
 
 
 def save_config(config: dict[str, Any]) -> None:
@@ -1,23 +1,47 @@
 """Tmux session management for HyperClaude swarm."""
 
+import asyncio
+import functools
+import itertools
 import math
 import os
 import re
+import select
+import shlex
 import shutil
 import subprocess
 import sys
+import threading
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
 from .config import (
-    load_config, get_hyperclaude_dir, init_hyperclaude, configure_claude_permissions,
+    load_config, get_hyperclaude_dir, get_fifo_dir, init_hyperclaude, configure_claude_permissions,
     register_session, unregister_session, get_session_info, get_active_session,
     get_default_session_name, set_active_session, list_sessions,
-    validate_message_length,
+    validate_message_length, get_sessions_dir, get_config_path, atomic_write_bytes,
 )
 
 
+# Claude's input prompt: a line that is just ">" with optional whitespace
+_PROMPT_RE = re.compile(r'^\s*>\s*$', re.MULTILINE)
+# Token count shown in Claude's status bar, e.g. "12345 tokens"
+_TOKENS_RE = re.compile(r'(\d+)\s+tokens')
+# Prompt and token count in one pass over a pane capture
+_PANE_SCAN_RE = re.compile(r'(?:(?P<tokens>\d+)\s+)?tokens|(?P<ready>^\s*>\s*$)', re.MULTILINE)
+# Shown while Claude is still processing
+_THINKING_MARKER = '∴ Thinking'
+# Pane user option holding a worker's self-reported state ("idle"/"working")
+_PANE_STATE_OPTION = "@hc_state"
+# Terminal escape sequences in raw pane output (CSI, OSC and two-byte escapes)
+_ANSI_RE = re.compile(r'\x1b(?:\[[0-?]*[ -/]*[@-~]|\][^\x07\x1b]*(?:\x07|\x1b\\)|[ -/]*[0-~])')
+
+
 def get_platform() -> str:
     """Detect the current platform."""
     if sys.platform == "darwin":
@@ -28,22 +52,55 @@ def get_platform() -> str:
         return "unknown"
 
 
-def find_linux_terminal(session: str) -> Optional[list[str]]:
-    """Find available terminal emulator on Linux."""
-    terminals = [
-        ("gnome-terminal", ["gnome-terminal", "--", "tmux", "attach", "-t", session]),
-        ("konsole", ["konsole", "-e", "tmux", "attach", "-t", session]),
-        ("xfce4-terminal", ["xfce4-terminal", "-e", f"tmux attach -t {session}"]),
-        ("alacritty", ["alacritty", "-e", "tmux", "attach", "-t", session]),
-        ("kitty", ["kitty", "tmux", "attach", "-t", session]),
-        ("xterm", ["xterm", "-e", f"tmux attach -t {session}"]),
-    ]
-    for name, cmd in terminals:
+# Supported Linux terminal emulators, in order of preference
+_LINUX_TERMINALS = ("gnome-terminal", "konsole", "xfce4-terminal", "alacritty", "kitty", "xterm")
+
+# $XDG_CURRENT_DESKTOP hints mapped to the desktop's native terminal
+_DESKTOP_TERMINALS = {
+    "gnome": "gnome-terminal",
+    "kde": "konsole",
+    "xfce": "xfce4-terminal",
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _find_linux_terminal_name() -> Optional[str]:
+    """Find an installed terminal emulator, trying environment hints first."""
+    candidates = []
+
+    terminal = os.path.basename(os.environ.get("TERMINAL", ""))
+    if terminal in _LINUX_TERMINALS:
+        candidates.append(terminal)
+
+    desktop = os.environ.get("XDG_CURRENT_DESKTOP", "").lower()
+    for hint, name in _DESKTOP_TERMINALS.items():
+        if hint in desktop:
+            candidates.append(name)
+
+    candidates.extend(_LINUX_TERMINALS)
+    for name in candidates:
         if shutil.which(name):
-            return cmd
+            return name
     return None
 
 
+def find_linux_terminal(session: str) -> Optional[list[str]]:
+    """Find available terminal emulator on Linux."""
+    name = _find_linux_terminal_name()
+    if name is None:
+        return None
+
+    terminals = {
+        "gnome-terminal": ["gnome-terminal", "--", "tmux", "attach", "-t", session],
+        "konsole": ["konsole", "-e", "tmux", "attach", "-t", session],
+        "xfce4-terminal": ["xfce4-terminal", "-x", "tmux", "attach", "-t", session],
+        "alacritty": ["alacritty", "-e", "tmux", "attach", "-t", session],
+        "kitty": ["kitty", "tmux", "attach", "-t", session],
+        "xterm": ["xterm", "-e", "tmux", "attach", "-t", session],
+    }
+    return terminals[name]
+
+
 def open_terminal_with_swarm(session: str) -> bool:
     """Open a terminal window attached to the swarm session."""
     platform = get_platform()
@@ -65,7 +122,15 @@ def open_terminal_with_swarm(session: str) -> bool:
     elif platform == "linux":
         terminal_cmd = find_linux_terminal(session)
         if terminal_cmd:
-            subprocess.Popen(terminal_cmd, start_new_session=True)
+            # Own session, so the terminal survives the launching shell's
+            # SIGHUP (xterm, alacritty and kitty don't detach themselves)
+            subprocess.Popen(
+                terminal_cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
             return True
         else:
             print("No supported terminal found. Attach manually: tmux attach -t swarm")
@@ -77,10 +142,95 @@ def open_terminal_with_swarm(session: str) -> bool:
         return False
 
 
+# tmux's absolute path, resolved once. subprocess only starts a program with
+# posix_spawn when its path has a directory component; a bare name goes
+# through fork+exec's PATH search.
+_TMUX = shutil.which("tmux") or "tmux"
+
+
 def run_tmux(args: list[str], check: bool = True) -> subprocess.CompletedProcess:
-    """Run a tmux command."""
-    cmd = ["tmux"] + args
-    return subprocess.run(cmd, capture_output=True, text=True, check=check)
+    """Run a tmux command.
+
+    Output is left as raw bytes; most commands' output is never read, so
+    decoding it would be wasted work. Use run_tmux_text when reading stdout.
+
+    While a TmuxWatcher is running the command goes over its control-mode
+    connection. Otherwise close_fds=False, together with the absolute path
+    in _TMUX, lets CPython start tmux with posix_spawn instead of fork+exec.
+    Nothing leaks: descriptors Python opens (FIFOs, lock files) are
+    non-inheritable by default, and the client only needs stdio.
+    """
+    cmd = [_TMUX] + args
+
+    # With a watcher running, send the command over its control connection
+    # instead of starting a client (command lines can't carry newlines)
+    watcher = _control_client()
+    if watcher is not None and not any("\n" in arg for arg in args):
+        commands = [[]]
+        for arg in args:
+            if arg == ";":
+                commands.append([])
+            else:
+                commands[-1].append(arg)
+        result = watcher.run(commands)
+        if result is not None:
+            completed = subprocess.CompletedProcess(cmd, *result)
+            if check:
+                completed.check_returncode()
+            return completed
+
+    return subprocess.run(cmd, capture_output=True, check=check, close_fds=False)
+
+
+def run_tmux_text(args: list[str], check: bool = True) -> subprocess.CompletedProcess:
+    """Run a tmux command and decode its stdout as UTF-8."""
+    result = run_tmux(args, check=check)
+    result.stdout = result.stdout.decode("utf-8", "replace")
+    return result
+
+
+def run_tmux_chain(commands: list[list[str]], check: bool = True) -> subprocess.CompletedProcess:
+    """Run several tmux commands in one tmux invocation.
+
+    tmux treats a standalone ";" argument as a command separator, so the
+    whole chain costs a single client process and server round-trip.
+    """
+    args = []
+    for command in commands:
+        if args:
+            args.append(";")
+        # tmux also splits on an argument that merely ends in ";" unless the
+        # semicolon is escaped (it strips the backslash again)
+        args.extend(arg[:-1] + "\\;" if arg.endswith(";") else arg for arg in command)
+    return run_tmux(args, check=check)
+
+
+# tmux rejects a client command line over about 16KB ("command too long"),
+# so chained commands are split into invocations below this many bytes
+_TMUX_CHAIN_MAX_BYTES = 12_000
+
+
+# Pause between typing text and pressing Enter. Text and Enter that reach
+# the pane in one read look like a paste to Claude, and the Enter doesn't
+# submit (see CLAUDE.md), so the Enter goes out in a separate tmux call.
+# No Escape before it either: ESC CR reads as Meta-Enter (insert a newline).
+_SUBMIT_DELAY = 0.2
+
+
+def _submit_panes(
+    targets: list[str],
+    extra_commands: Optional[list[list[str]]] = None,
+    check: bool = True,
+) -> None:
+    """Press Enter in panes whose text was just typed, after _SUBMIT_DELAY.
+
+    extra_commands (e.g. @hc_state updates) run in the same tmux call.
+    """
+    time.sleep(_SUBMIT_DELAY)
+    run_tmux_chain(
+        [["send-keys", "-t", target, "Enter"] for target in targets] + (extra_commands or []),
+        check=check,
+    )
 
 
 def batch_send_keys(
@@ -89,51 +239,349 @@ def batch_send_keys(
     pane_messages: list[tuple[int, str]],
     send_enter: bool = True
 ) -> None:
-    """Send messages to multiple panes efficiently via tmux script.
+    """Send messages to multiple panes efficiently via chained tmux commands.
 
-    This is much faster than individual send-keys calls for many panes.
+    This is much faster than individual send-keys calls for many panes: the
+    send-keys commands are chained with ";" into as few tmux invocations as
+    the command-length limit allows, and every pane is submitted after one
+    shared delay (see _submit_panes).
     """
     if not pane_messages:
         return
 
-    script_file = get_hyperclaude_dir() / "batch_commands.tmux"
+    targets = []
+    chain: list[list[str]] = []
+    chain_bytes = 0
+    for pane, message in pane_messages:
+        target = f"{session}:{window}.{pane}"
+        size = len(message.encode()) + 64
+        if size > _TMUX_CHAIN_MAX_BYTES and send_enter:
+            # Too long for any command line; goes through a paste buffer
+            _send_message(target, message)
+            continue
+
+        if chain and chain_bytes + size > _TMUX_CHAIN_MAX_BYTES:
+            run_tmux_chain(chain, check=False)
+            chain, chain_bytes = [], 0
+        chain.append(["send-keys", "-t", target, "-l", "--", message])
+        targets.append(target)
+        chain_bytes += size
+
+    if chain:
+        run_tmux_chain(chain, check=False)
+    if send_enter and targets:
+        _submit_panes(targets, check=False)
+
+
+# Read ends of the FIFOs that tmux pipe-pane mirrors pane output into,
+# keyed by pane target
+_pane_fifos: dict[str, int] = {}
+
+# tmux wait-for channels that each pane's pipe-pane hook signals the first
+# time the pane shows a prompt after being armed, keyed by pane target
+_pane_ready_channels: dict[str, str] = {}
+
+# Makes every arming's channel unique, so a signal nobody waited for (which
+# tmux remembers) can't satisfy a later wait
+_ready_arm_counter = itertools.count()
+
+# Characters not used in wait-for channel names derived from pane targets
+_CHANNEL_UNSAFE_RE = re.compile(r'[^A-Za-z0-9_-]')
+
+# grep -E equivalent of _shows_prompt, run by the pipe-pane hook. The hook
+# sees raw pane output, so the prompt line may carry escape sequences and
+# CRs around the ">" (e.g. "\033[?2004l\r>\r"); they're matched in place
+# rather than stripped by another filter, which would buffer the output.
+_READY_GREP_ESC = '\x1b\\[[0-?]*[ -/]*[@-~]'
+_READY_GREP = (
+    f'tokens|^([[:space:]]|{_READY_GREP_ESC})*>([[:space:]]|{_READY_GREP_ESC})*$'
+)
+
+
+def _get_pane_fifo_path(pane: str) -> Path:
+    """Get the FIFO path that mirrors a pane's output."""
+    return get_fifo_dir() / f"{pane.replace(':', '_')}.out"
+
+
+def open_pane_fifo(pane: str) -> Optional[int]:
+    """Mirror a pane's output into a FIFO with tmux pipe-pane.
+
+    The same pipeline also signals the pane's tmux wait-for channel the first
+    time the output shows a prompt, so wait_for_pane_ready can block on it.
+
+    Returns the non-blocking read end, or None if the FIFO couldn't be set up
+    (callers then fall back to capture-pane polling).
+    """
+    if pane in _pane_fifos:
+        return _pane_fifos[pane]
+
+    path = _get_pane_fifo_path(pane)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.unlink(missing_ok=True)
+        os.mkfifo(path)
+        # O_RDWR also counts as a writer, so the open never blocks and the
+        # FIFO never reports EOF between pipe-pane writes
+        fd = os.open(path, os.O_RDWR | os.O_NONBLOCK)
+    except OSError:
+        return None
+
+    command, channel = _ready_hook_command(pane, path)
+    result = run_tmux(command, check=False)
+    if result.returncode != 0:
+        os.close(fd)
+        path.unlink(missing_ok=True)
+        return None
+
+    _pane_fifos[pane] = fd
+    _pane_ready_channels[pane] = channel
+    return fd
+
+
+def _ready_hook_command(pane: str, path: Path) -> tuple[list[str], str]:
+    """Build the pipe-pane command that mirrors a pane into its FIFO.
+
+    Returns the tmux command and the fresh wait-for channel its hook signals.
+    """
+    channel = f"hc-ready-{_CHANNEL_UNSAFE_RE.sub('-', pane)}-{next(_ready_arm_counter)}"
+    # pipe-pane format-expands the command, so the hook signals the same server
+    shell_command = (
+        f"tee {shlex.quote(str(path))} | "
+        f"{{ LC_ALL=C grep -a -q -E {shlex.quote(_READY_GREP)} && "
+        f"tmux -S #{{q:socket_path}} wait-for -S {channel}; cat > /dev/null; }}"
+    )
+    return ["pipe-pane", "-t", pane, shell_command], channel
+
+
+def arm_pane_ready_signals(panes: list[str]) -> None:
+    """Re-arm the ready signal of panes that have an output FIFO.
+
+    Each hook only fires once, so call this before sending something the
+    next wait_for_pane_ready should wake on. Re-running pipe-pane replaces
+    the old pipeline in a single chained tmux call.
+    """
     commands = []
+    channels = {}
+    for pane in panes:
+        if pane in _pane_fifos:
+            # Output left over from earlier phases would otherwise fill the
+            # pipe and stall the new hook's tee
+            _drain_fifo(_pane_fifos[pane])
+            command, channels[pane] = _ready_hook_command(pane, _get_pane_fifo_path(pane))
+            commands.append(command)
+    if commands and run_tmux_chain(commands, check=False).returncode == 0:
+        _pane_ready_channels.update(channels)
+
+
+def close_pane_fifos() -> None:
+    """Stop all pipe-pane mirrors and remove their FIFOs."""
+    for pane, fd in _pane_fifos.items():
+        run_tmux(["pipe-pane", "-t", pane], check=False)
+        os.close(fd)
+        _get_pane_fifo_path(pane).unlink(missing_ok=True)
+    _pane_fifos.clear()
+    _pane_ready_channels.clear()
+
+
+def _drain_fifo(fd: int) -> str:
+    """Read everything currently buffered in a non-blocking FIFO."""
+    chunks = []
+    while True:
+        try:
+            data = os.read(fd, 65536)
+        except BlockingIOError:
+            break
+        if not data:
+            break
+        chunks.append(data)
+    return b"".join(chunks).decode("utf-8", "replace")
+
+
+def _scan_pane(output: str) -> tuple[Optional[int], bool]:
+    """Scan pane output once for its token count and whether it's ready.
+
+    Ready means Claude's prompt (a line that is just ">") or its status bar
+    (which mentions "tokens") is showing.
+    """
+    tokens = None
+    ready = False
+    for match in _PANE_SCAN_RE.finditer(output):
+        ready = True
+        if match.group("tokens") is not None:
+            tokens = int(match.group("tokens"))
+            break
+    return tokens, ready
 
-    for pane, message in pane_messages:
-        # Escape single quotes for tmux
-        escaped = message.replace("'", "'\\''")
-        commands.append(f"send-keys -t {session}:{window}.{pane} '{escaped}'")
-        if send_enter:
-            commands.append(f"send-keys -t {session}:{window}.{pane} Enter")
 
-    script_file.write_text("\n".join(commands))
+def _shows_prompt(output: str) -> bool:
+    """Check pane output for Claude's prompt or its status bar."""
+    return _scan_pane(output)[1]
+
+
+def _thinking_after_prompt(output: str) -> bool:
+    """Check whether a "Thinking" marker follows the last prompt line.
+
+    A stale marker above a live prompt (scrolled into the capture) doesn't
+    count; is_worker_idle goes by the same ordering.
+    """
+    prompt_at = max((m.start() for m in _PROMPT_RE.finditer(output)), default=-1)
+    return output.rfind(_THINKING_MARKER) > prompt_at
+
+
+# wait_for_pane_ready's poll interval: starts at the minimum and grows by the
+# backoff factor, up to the maximum, while captures come back unchanged
+_READY_POLL_MIN = 0.05
+_READY_POLL_BACKOFF = 1.3
+_READY_POLL_MAX = 0.5
+
+# How long a pane with an output FIFO must stay silent, showing its prompt,
+# to count as ready. Claude redraws its spinner more often than this while
+# it works, so a quiet pane is an idle one.
+_READY_SETTLE = 0.25
+
+
+def wait_for_pane_ready(pane: str, timeout: int = 30) -> bool:
+    """Wait until Claude shows its input prompt (>) in the pane.
+
+    If the pane's ready signal is armed (see open_pane_fifo and
+    arm_pane_ready_signals), this first blocks in `tmux wait-for` until the
+    pipe-pane hook fires, without capturing the pane. The signal is used up
+    by the wait.
+
+    Then (or straight away, with no signal armed) it polls every 0.05s at
+    first, backing off by 1.3x (up to 0.5s) while the pane stays unchanged
+    and dropping back to 0.05s when it changes. The pane only counts as
+    ready once the prompt has been seen twice without the pane changing, so
+    a prompt caught mid-render isn't mistaken for a settled one. With an
+    output FIFO the poll blocks on it and only re-captures the pane once it
+    has written something, and the prompt must then stay silent for
+    _READY_SETTLE seconds.
+    """
+    start = time.time()
+    channel = _pane_ready_channels.pop(pane, None)
+    if channel is not None:
+        _wait_for_channel(channel, timeout, _pane_fifos.get(pane))
+
+    # The signal only says the pane printed something prompt-like since it
+    # was armed (which typed input echoed back can do too), so confirm with
+    # the settle check. Without a signal (or if tmux couldn't wait on it),
+    # that check is the whole wait; if the signal timed out, it gets the
+    # pane's last word, since the hook can miss a prompt the capture shows.
+    remaining = max(0.0, timeout - (time.time() - start))
+    return _wait_for_pane_ready(pane, remaining, _pane_fifos.get(pane))
+
+
+def _wait_for_channel(channel: str, timeout: float, fifo_fd: Optional[int] = None) -> Optional[bool]:
+    """Block until a tmux wait-for channel is signalled.
+
+    If the pane has an output FIFO it is drained while waiting: the hook
+    tees the pane into it, and once the pipe filled up tee would block and
+    the hook would never see the output that signals the channel.
+
+    Returns True once signalled, False on timeout, or None if tmux couldn't
+    wait on the channel.
+    """
+    # The waiter's stdout reaches EOF when it exits, so select() can watch
+    # for that and for pane output at the same time
+    waiter = subprocess.Popen(
+        ["tmux", "wait-for", channel],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + timeout
+    watched = [waiter.stdout] + ([fifo_fd] if fifo_fd is not None else [])
     try:
-        run_tmux(["source-file", str(script_file)], check=False)
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                waiter.kill()
+                waiter.wait()
+                return False
+            readable, _, _ = select.select(watched, [], [], remaining)
+            if fifo_fd in readable:
+                _drain_fifo(fifo_fd)
+            if waiter.stdout in readable:
+                return True if waiter.wait() == 0 else None
     finally:
-        if script_file.exists():
-            script_file.unlink()
+        waiter.stdout.close()
 
 
-def wait_for_pane_ready(pane: str, timeout: int = 30) -> bool:
-    """Wait until Claude shows its input prompt (>) in the pane."""
-    import re
-    for _ in range(timeout * 4):  # Check every 0.25s for faster response
-        result = run_tmux(["capture-pane", "-t", pane, "-p", "-S", "-5"], check=False)
+def wait_for_panes_ready(panes: list[str], timeout: int = 30) -> list[bool]:
+    """Run wait_for_pane_ready on several panes at once.
+
+    Each pane is independent, so the whole wait takes as long as the slowest
+    pane rather than the sum of them. Results are in the same order as panes.
+    """
+    if not panes:
+        return []
+    with ThreadPoolExecutor(max_workers=len(panes)) as executor:
+        return list(executor.map(lambda pane: wait_for_pane_ready(pane, timeout), panes))
+
+
+def _wait_for_pane_ready(pane: str, timeout: float, fifo_fd: Optional[int]) -> bool:
+    """Polling loop behind wait_for_pane_ready."""
+    start = time.time()
+    interval = _READY_POLL_MIN
+    last_output = None
+    last_ready_output = None
+    while True:
+        elapsed = time.time() - start
+        result = run_tmux_text(["capture-pane", "-t", pane, "-p", "-S", "-3", "-E", "-"], check=False)
         if result.returncode == 0:
-            # Look for Claude's prompt: ">" at start of line, or "> " input area
-            # Also check for "tokens" which appears in the status bar when ready
             output = result.stdout
-            if re.search(r'^\s*>\s*$', output, re.MULTILINE) or 'tokens' in output:
+            if _shows_prompt(output) and not _thinking_after_prompt(output):
+                if output == last_ready_output:
+                    return True
+                last_ready_output = output
+            else:
+                last_ready_output = None
+
+            # Stretch the interval while nothing is happening in the pane
+            if output == last_output:
+                interval = min(interval * _READY_POLL_BACKOFF, _READY_POLL_MAX)
+            else:
+                interval = _READY_POLL_MIN
+            last_output = output
+        if elapsed >= timeout:
+            # Out of time: go by the last capture alone
+            return last_ready_output is not None
+
+        if fifo_fd is None:
+            time.sleep(min(interval, timeout - elapsed))
+            continue
+
+        # A prompt that stays quiet for _READY_SETTLE has settled; otherwise
+        # sleep until the pane writes something rather than re-capturing it
+        wait = max(interval, _READY_SETTLE) if last_ready_output is not None else timeout - elapsed
+        readable, _, _ = select.select([fifo_fd], [], [], max(0.0, wait))
+        if not readable:
+            if last_ready_output is not None:
                 return True
-        time.sleep(0.25)
-    return False
+            continue
+        if not _shows_prompt(_ANSI_RE.sub("", _drain_fifo(fifo_fd))):
+            # Let the burst of output finish before capturing again
+            time.sleep(interval)
+            _drain_fifo(fifo_fd)
 
 
-def is_swarm_running(session_name: Optional[str] = None) -> bool:
+def get_session_set() -> set[str]:
+    """Get the names of all running tmux sessions with a single tmux call."""
+    result = run_tmux_text(["list-sessions", "-F", "#{session_name}"], check=False)
+    if result.returncode != 0:
+        # No tmux server running
+        return set()
+    return set(result.stdout.split())
+
+
+def is_swarm_running(
+    session_name: Optional[str] = None,
+    session_set: Optional[set[str]] = None,
+) -> bool:
     """Check if a swarm tmux session exists.
 
     If session_name is provided, checks that specific session.
     Otherwise, checks the active session or falls back to 'swarm'.
+    Pass session_set (from get_session_set) to check against an existing
+    snapshot instead of querying tmux again.
     """
     if session_name:
         session = session_name
@@ -146,178 +594,646 @@ def is_swarm_running(session_name: Optional[str] = None) -> bool:
             config = load_config()
             session = config["tmux_session"]
 
+    if session_set is not None:
+        return session in session_set
+
     result = run_tmux(["has-session", "-t", session], check=False)
     return result.returncode == 0
 
 
 def is_any_swarm_running() -> bool:
     """Check if any registered hyperclaude session is running."""
-    sessions = list_sessions()
-    for sess_info in sessions:
-        name = sess_info.get("name")
-        if name and is_swarm_running(name):
-            return True
-    return False
+    running = get_session_set()
+    return any(sess_info.get("name") in running for sess_info in list_sessions())
 
 
-def get_pane_target(worker_id: int, session_name: Optional[str] = None) -> str:
-    """Get the tmux pane target for a worker.
+@dataclass(frozen=True)
+class SessionSnapshot:
+    """Resolved tmux location of a swarm session.
 
-    If session_name is provided, uses that session.
-    Otherwise uses the active session or falls back to config default.
+    Build one per high-level operation and pass it down so per-worker helpers
+    don't each re-read session metadata and config from disk.
     """
-    if session_name:
-        session_info = get_session_info(session_name)
-        if session_info:
-            return f"{session_info['tmux_session']}:{session_info['tmux_window']}.{worker_id}"
+    tmux_session: str
+    tmux_window: str
+    num_workers: int
+    workspace: Optional[str] = None
+
+    def pane_target(self, worker_id: int) -> str:
+        """Get the tmux pane target for a worker."""
+        return f"{self.tmux_session}:{self.tmux_window}.{worker_id}"
+
+    @property
+    def manager_target(self) -> str:
+        """Get the tmux pane target for the manager (always the last pane)."""
+        return self.pane_target(self.num_workers)
+
+
+def _session_files_stamp() -> tuple[Optional[int], ...]:
+    """mtimes of the files session resolution depends on (None if missing).
+
+    The active-session marker, the sessions directory (which changes when a
+    session is registered or removed) and the config file.
+    """
+    stamp = []
+    for path in (get_hyperclaude_dir() / "active_session", get_sessions_dir(), get_config_path()):
+        try:
+            stamp.append(path.stat().st_mtime_ns)
+        except FileNotFoundError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
+def _resolve_session(session_name: Optional[str] = None) -> SessionSnapshot:
+    """Resolve a session name to its tmux location.
+
+    Tries the named session, then the active session, then config defaults.
+    Cached until one of the files it reads changes on disk (a few stats
+    instead of re-reading session metadata and config on every call).
+    """
+    return _resolve_session_cached(session_name, _session_files_stamp())
+
+
+@functools.lru_cache(maxsize=32)
+def _resolve_session_cached(
+    session_name: Optional[str],
+    stamp: tuple[Optional[int], ...],
+) -> SessionSnapshot:
+    """Uncached body of _resolve_session; stamp only keys the cache."""
+    session_info = get_session_info(session_name) if session_name else None
 
     # Fall back to active session
-    active = get_active_session()
-    if active:
-        session_info = get_session_info(active)
-        if session_info:
-            return f"{session_info['tmux_session']}:{session_info['tmux_window']}.{worker_id}"
+    if not session_info:
+        active = get_active_session()
+        session_info = get_session_info(active) if active else None
+
+    if session_info:
+        return SessionSnapshot(
+            tmux_session=session_info["tmux_session"],
+            tmux_window=session_info["tmux_window"],
+            num_workers=session_info.get("num_workers", 6),
+            workspace=session_info.get("workspace"),
+        )
 
     # Fall back to config defaults
     config = load_config()
-    return f"{config['tmux_session']}:{config['tmux_window']}.{worker_id}"
+    return SessionSnapshot(
+        tmux_session=config["tmux_session"],
+        tmux_window=config["tmux_window"],
+        num_workers=config["default_workers"],
+    )
+
+
+def get_session_snapshot(session_name: Optional[str] = None) -> SessionSnapshot:
+    """Get the resolved tmux location for a session (active session by default)."""
+    return _resolve_session(session_name)
+
 
+def get_pane_target(
+    worker_id: int,
+    session_name: Optional[str] = None,
+    snapshot: Optional[SessionSnapshot] = None,
+) -> str:
+    """Get the tmux pane target for a worker.
 
-def get_manager_pane_target(session_name: Optional[str] = None) -> str:
+    If session_name is provided, uses that session.
+    Otherwise uses the active session or falls back to config default.
+    """
+    snapshot = snapshot or _resolve_session(session_name)
+    return snapshot.pane_target(worker_id)
+
+
+def get_manager_pane_target(
+    session_name: Optional[str] = None,
+    snapshot: Optional[SessionSnapshot] = None,
+) -> str:
     """Get the tmux pane target for the manager.
 
     Manager is always the last pane (pane N where N = num_workers).
     """
-    if session_name:
-        session_info = get_session_info(session_name)
-        if session_info:
-            num_workers = session_info.get("num_workers", 6)
-            return f"{session_info['tmux_session']}:{session_info['tmux_window']}.{num_workers}"
+    snapshot = snapshot or _resolve_session(session_name)
+    return snapshot.manager_target
 
-    # Fall back to active session
-    active = get_active_session()
-    if active:
-        session_info = get_session_info(active)
-        if session_info:
-            num_workers = session_info.get("num_workers", 6)
-            return f"{session_info['tmux_session']}:{session_info['tmux_window']}.{num_workers}"
 
-    # Fall back to config defaults
-    config = load_config()
-    return f"{config['tmux_session']}:{config['tmux_window']}.{config['default_workers']}"
+def _send_message(target: str, message: str, state: Optional[str] = None) -> None:
+    """Type a message into a pane, then submit it (see _submit_panes).
 
+    If state is given, the pane's @hc_state option is set with the Enter.
+    """
+    state_commands = [_pane_state_command(target, state)] if state else []
+    if "\n" not in message and len(message.encode()) < _TMUX_CHAIN_MAX_BYTES:
+        # -l: literal, so words like "Enter" aren't looked up as keys
+        run_tmux(["send-keys", "-t", target, "-l", "--", message])
+        _submit_panes([target], state_commands)
+        return
 
-def send_to_worker(worker_id: int, message: str, session_name: Optional[str] = None) -> None:
-    """Send a message to a worker pane."""
+    # Multi-line (or very long) text goes through a paste buffer fed on stdin,
+    # so the whole message lands in one paste instead of relying on timing
+    # between keys.
+    # -p wraps it in bracketed-paste markers when the pane asked for them, so
+    # the newlines don't submit early and a plain Enter sends it.
+    buffer_name = f"hc-{os.getpid()}"
+    subprocess.run(
+        [
+            "tmux", "load-buffer", "-b", buffer_name, "-", ";",
+            "paste-buffer", "-b", buffer_name, "-d", "-p", "-t", target,
+        ],
+        input=message, capture_output=True, text=True, check=True,
+    )
+    _submit_panes([target], state_commands)
+
+
+def _pane_state_command(target: str, state: str) -> list[str]:
+    """tmux command that records a worker's state in its pane's @hc_state option."""
+    return ["set-option", "-p", "-t", target, _PANE_STATE_OPTION, state]
+
+
+def set_pane_state(target: str, state: str) -> None:
+    """Record a worker's state ("idle" or "working") on its pane.
+
+    Workers call this for their own pane via $TMUX_PANE, so is_worker_idle can
+    read the state back without capturing and scanning the pane.
+    """
+    run_tmux(_pane_state_command(target, state), check=False)
+
+
+def send_to_worker(
+    worker_id: int,
+    message: str,
+    session_name: Optional[str] = None,
+    snapshot: Optional[SessionSnapshot] = None,
+    state: Optional[str] = None,
+) -> None:
+    """Send a message to a worker pane.
+
+    If state is given ("working" when dispatching a task), it is recorded in
+    the pane's @hc_state option in the same tmux invocation.
+    """
     validate_message_length(message)
-    target = get_pane_target(worker_id, session_name)
-    # Send text - for multi-line, Claude CLI enters "paste mode"
-    run_tmux(["send-keys", "-t", target, message])
-    # Small delay to let paste mode complete
-    time.sleep(0.2)
-    # Escape ensures we exit any special input mode
-    run_tmux(["send-keys", "-t", target, "Escape"])
-    time.sleep(0.1)
-    # Send Enter to submit the message
-    run_tmux(["send-keys", "-t", target, "Enter"])
+    target = get_pane_target(worker_id, session_name, snapshot)
+    _send_message(target, message, state=state)
 
 
 def send_to_manager(message: str, session_name: Optional[str] = None) -> None:
     """Send a message to the manager pane."""
     validate_message_length(message)
     target = get_manager_pane_target(session_name)
-    # Send text - for multi-line, Claude CLI enters "paste mode"
-    run_tmux(["send-keys", "-t", target, message])
-    # Small delay to let paste mode complete
-    time.sleep(0.2)
-    # Escape ensures we exit any special input mode
-    run_tmux(["send-keys", "-t", target, "Escape"])
-    time.sleep(0.1)
-    # Send Enter to submit the message
-    run_tmux(["send-keys", "-t", target, "Enter"])
-
-
-def capture_pane(worker_id: int, lines: int = 50, session_name: Optional[str] = None) -> str:
+    _send_message(target, message)
+
+
+def capture_pane(
+    worker_id: int,
+    lines: int = 50,
+    session_name: Optional[str] = None,
+    snapshot: Optional[SessionSnapshot] = None,
+) -> str:
     """Capture output from a worker pane."""
-    target = get_pane_target(worker_id, session_name)
-    result = run_tmux(["capture-pane", "-t", target, "-p", "-S", f"-{lines}"])
+    target = get_pane_target(worker_id, session_name, snapshot)
+    result = run_tmux_text(["capture-pane", "-t", target, "-p", "-S", f"-{lines}"])
     return result.stdout
 
 
-def get_worker_tokens(worker_id: int, session_name: Optional[str] = None) -> Optional[int]:
-    """Get the token count for a worker from its pane output."""
-    output = capture_pane(worker_id, lines=10, session_name=session_name)
-    # Look for pattern like "12345 tokens"
-    import re
-    match = re.search(r"(\d+)\s+tokens", output)
-    if match:
-        return int(match.group(1))
+def capture_pane_to_fd(
+    worker_id: int,
+    fd: int,
+    start: int,
+    end: Optional[int] = None,
+    session_name: Optional[str] = None,
+    snapshot: Optional[SessionSnapshot] = None,
+) -> None:
+    """Write a range of a worker pane (negative line numbers) straight to fd.
+
+    tmux's stdout is the descriptor itself, so the content never passes
+    through Python. Always starts a client, bypassing any control connection.
+    """
+    target = get_pane_target(worker_id, session_name, snapshot)
+    args = [_TMUX, "capture-pane", "-t", target, "-p", "-S", str(start)]
+    if end is not None:
+        args += ["-E", str(end)]
+    subprocess.run(args, stdout=fd, stderr=subprocess.DEVNULL, check=True, close_fds=False)
+
+
+# Per-pane fields fetched by list_pane_metadata, tab-separated
+_PANE_METADATA_FORMAT = "\t".join([
+    "#{pane_index}", "#{pane_id}", "#{pane_dead}", "#{pane_current_command}",
+    "#{history_size}", "#{history_limit}", "#{" + _PANE_STATE_OPTION + "}",
+])
+
+
+def list_pane_metadata(session: str, window: str) -> list[dict]:
+    """Get metadata for every pane in a window with one list-panes call.
+
+    Each dict has index, id, dead, command, history_size, history_limit and
+    state (the pane's @hc_state, "" if unset). Returns [] if the window is gone.
+    """
+    result = run_tmux_text(
+        ["list-panes", "-t", f"{session}:{window}", "-F", _PANE_METADATA_FORMAT], check=False
+    )
+    if result.returncode != 0:
+        return []
+
+    panes = []
+    for line in result.stdout.splitlines():
+        index, pane_id, dead, command, history_size, history_limit, state = line.split("\t")
+        panes.append({
+            "index": int(index),
+            "id": pane_id,
+            "dead": dead == "1",
+            "command": command,
+            "history_size": int(history_size),
+            "history_limit": int(history_limit),
+            "state": state,
+        })
+    return panes
+
+
+def get_all_worker_outputs(
+    lines: int = 10,
+    session_name: Optional[str] = None,
+    snapshot: Optional[SessionSnapshot] = None,
+    worker_ids: Optional[list[int]] = None,
+) -> dict[int, str]:
+    """Capture recent output from every worker pane (or just worker_ids).
+
+    The captures run concurrently so the tmux round-trips overlap instead of
+    adding up. Panes that can't be captured map to an empty string.
+    """
+    snapshot = snapshot or _resolve_session(session_name)
+    if worker_ids is None:
+        worker_ids = list(range(snapshot.num_workers))
+    if not worker_ids:
+        return {}
+
+    async def capture_all() -> list[str]:
+        return await asyncio.gather(*(
+            _capture_pane_async(snapshot.pane_target(i), lines) for i in worker_ids
+        ))
+
+    return dict(zip(worker_ids, asyncio.run(capture_all())))
+
+
+async def _capture_pane_async(target: str, lines: int) -> str:
+    """Capture a pane without blocking, returning "" if it can't be captured."""
+    proc = await asyncio.create_subprocess_exec(
+        "tmux", "capture-pane", "-t", target, "-p", "-S", f"-{lines}",
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+    )
+    out, _ = await proc.communicate()
+    return out.decode("utf-8", "replace") if proc.returncode == 0 else ""
+
+
+# Control-mode %output escapes bytes below 0x20 and backslash as \ooo
+_CONTROL_ESCAPE_RE = re.compile(rb'\\([0-7]{3})')
+
+# How long to wait for a control-mode reply before giving up on the
+# connection and falling back to the tmux CLI
+_CONTROL_REPLY_TIMEOUT = 5.0
+
+
+class TmuxWatcher:
+    """Follow a session's pane output over one tmux control-mode connection.
+
+    A background thread reads the %output notifications of `tmux -C attach`
+    and keeps each pane's most recent output (ANSI-stripped) in memory, so
+    status checks can look at what a worker printed last without spawning
+    tmux. The same connection also runs tmux commands (see run), which
+    run_tmux uses instead of starting a tmux client per call. Start one with
+    watch_session().
+    """
+
+    def __init__(self, session: str, window: str, maxlen: int = 200):
+        self.session = session
+        self.window = window
+        self._maxlen = maxlen
+        self._outputs: dict[str, deque[str]] = {}
+        self._pane_ids: dict[int, str] = {}
+        self._lock = threading.Lock()
+        # Commands awaiting their %begin/%end reply, in the order they were sent
+        self._pending: deque[Future] = deque()
+        self._write_lock = threading.Lock()
+        self._proc = subprocess.Popen(
+            ["tmux", "-C", "attach", "-t", session],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        )
+        self._thread = threading.Thread(target=self._read_loop, daemon=True)
+        self._thread.start()
+
+    @property
+    def alive(self) -> bool:
+        """Whether the control-mode client is still attached."""
+        return self._proc.poll() is None
+
+    def _read_loop(self) -> None:
+        block = None
+        for line in self._proc.stdout:
+            if block is not None:
+                # Output of a command, until the %end/%error carrying the
+                # same time and number as its %begin
+                parts = line.split()
+                if len(parts) == 4 and parts[0] in (b"%end", b"%error") and parts[1:3] == block[1:3]:
+                    # Flag 1 marks commands this client sent; others (like
+                    # the attach itself) have no one waiting on them
+                    if block[3] == b"1" and self._pending:
+                        self._pending.popleft().set_result((parts[0] == b"%end", b"".join(block_lines)))
+                    block = None
+                else:
+                    block_lines.append(line)
+                continue
+
+            if line.startswith(b"%begin "):
+                block, block_lines = line.split(), []
+                continue
+
+            parts = line.rstrip(b"\n").split(b" ", 2)
+            if len(parts) != 3 or parts[0] != b"%output":
+                continue
+            _, pane_id, data = parts
+            data = _CONTROL_ESCAPE_RE.sub(lambda m: bytes([int(m.group(1), 8)]), data)
+            text = _ANSI_RE.sub("", data.decode("utf-8", "replace"))
+
+            with self._lock:
+                chunks = self._outputs.get(pane_id.decode())
+                if chunks is None:
+                    chunks = self._outputs[pane_id.decode()] = deque(maxlen=self._maxlen)
+                chunks.append(text)
+
+        # Connection gone: callers still waiting fall back to the tmux CLI
+        while self._pending:
+            self._pending.popleft().set_result(None)
+
+    def run(self, commands: list[list[str]]) -> Optional[tuple[int, bytes, bytes]]:
+        """Run tmux commands over the control connection.
+
+        Each command is sent as its own line and answered in its own
+        %begin/%end block. Returns (returncode, stdout, stderr) like the tmux
+        CLI would, or None if the connection is gone or a reply doesn't
+        arrive within _CONTROL_REPLY_TIMEOUT.
+        """
+        futures = []
+        with self._write_lock:
+            if not self.alive:
+                return None
+            lines = "".join(" ".join(_control_quote(arg) for arg in command) + "\n" for command in commands)
+            for _ in commands:
+                future = Future()
+                self._pending.append(future)
+                futures.append(future)
+            try:
+                self._proc.stdin.write(lines.encode())
+                self._proc.stdin.flush()
+            except (BrokenPipeError, ValueError):
+                # The reader resolves the queued futures once stdout closes
+                pass
+
+        deadline = time.monotonic() + _CONTROL_REPLY_TIMEOUT
+        try:
+            results = [future.result(timeout=max(0.0, deadline - time.monotonic())) for future in futures]
+        except FutureTimeoutError:
+            # A late reply would be matched to the next command sent, so drop
+            # the connection; the reader then resolves what's still pending
+            self._proc.kill()
+            self._proc.wait()
+            return None
+        if any(result is None for result in results):
+            return None
+
+        stdout = b"".join(output for ok, output in results if ok)
+        stderr = b"".join(output for ok, output in results if not ok)
+        returncode = 0 if all(ok for ok, _ in results) else 1
+        return returncode, stdout, stderr
+
+    def _pane_id(self, pane_index: int) -> Optional[str]:
+        """Map a pane index to tmux's pane id (%N), listing the panes once."""
+        if not self._pane_ids:
+            result = run_tmux_text(
+                ["list-panes", "-t", f"{self.session}:{self.window}", "-F", "#{pane_index} #{pane_id}"],
+                check=False,
+            )
+            if result.returncode == 0:
+                for line in result.stdout.splitlines():
+                    index, pane_id = line.split()
+                    self._pane_ids[int(index)] = pane_id
+        return self._pane_ids.get(pane_index)
+
+    def recent_output(self, pane_index: int) -> Optional[str]:
+        """Get a pane's recent output, or None if it hasn't printed anything yet."""
+        pane_id = self._pane_id(pane_index)
+        with self._lock:
+            chunks = self._outputs.get(pane_id)
+            return "".join(chunks) if chunks else None
+
+    def close(self) -> None:
+        """Detach the control-mode client and stop the reader thread."""
+        if self._proc.poll() is None:
+            # A control client detaches once its stdin is closed
+            self._proc.stdin.close()
+            try:
+                self._proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+                self._proc.wait()
+        self._thread.join(timeout=1)
+
+
+# Running watchers keyed by tmux session name
+_WATCHERS: dict[str, TmuxWatcher] = {}
+
+
+def _control_quote(arg: str) -> str:
+    """Quote a tmux CLI argument for a control-mode command line."""
+    # The CLI turns a trailing "\;" into a literal ";" (see run_tmux_chain);
+    # inside single quotes the semicolon needs no escaping
+    if arg.endswith("\\;"):
+        arg = arg[:-2] + ";"
+    return "'" + arg.replace("'", "'\\''") + "'"
+
+
+def _control_client() -> Optional[TmuxWatcher]:
+    """Get any running watcher; they all talk to the same tmux server."""
+    for watcher in _WATCHERS.values():
+        if watcher.alive:
+            return watcher
+    return None
+
+
+def watch_session(session_name: Optional[str] = None) -> TmuxWatcher:
+    """Start (or reuse) a control-mode watcher for a session.
+
+    While it runs, get_worker_tokens, is_worker_idle and get_swarm_status read
+    the session's panes from it and only capture a pane when it has nothing
+    conclusive to go on.
+    """
+    snapshot = _resolve_session(session_name)
+    watcher = _WATCHERS.get(snapshot.tmux_session)
+    if watcher is None or not watcher.alive:
+        watcher = TmuxWatcher(snapshot.tmux_session, snapshot.tmux_window)
+        _WATCHERS[snapshot.tmux_session] = watcher
+    return watcher
+
+
+def _get_watcher(snapshot: SessionSnapshot) -> Optional[TmuxWatcher]:
+    """Get the running watcher for a session, if any."""
+    watcher = _WATCHERS.get(snapshot.tmux_session)
+    if watcher is not None and watcher.alive:
+        return watcher
     return None
 
 
+def _watched_tokens(snapshot: SessionSnapshot, worker_id: int) -> Optional[int]:
+    """Latest token count a watched worker printed, if any."""
+    watcher = _get_watcher(snapshot)
+    output = watcher.recent_output(worker_id) if watcher else None
+    if not output:
+        return None
+    counts = _TOKENS_RE.findall(output)
+    return int(counts[-1]) if counts else None
+
+
+def _parse_tokens(output: str) -> Optional[int]:
+    """Extract the token count from pane output, if shown."""
+    return _scan_pane(output)[0]
+
+
+def snapshot_pane(
+    worker_id: int,
+    lines: int = 10,
+    session_name: Optional[str] = None,
+    snapshot: Optional[SessionSnapshot] = None,
+) -> tuple[Optional[int], bool]:
+    """Capture a worker pane once and return (tokens, ready) from it."""
+    return _scan_pane(capture_pane(worker_id, lines=lines, session_name=session_name, snapshot=snapshot))
+
+
+def get_worker_tokens(
+    worker_id: int,
+    session_name: Optional[str] = None,
+    snapshot: Optional[SessionSnapshot] = None,
+) -> Optional[int]:
+    """Get the token count for a worker from its pane output."""
+    snapshot = snapshot or _resolve_session(session_name)
+    tokens = _watched_tokens(snapshot, worker_id)
+    if tokens is not None:
+        return tokens
+    return snapshot_pane(worker_id, lines=10, snapshot=snapshot)[0]
+
+
 def is_worker_idle(worker_id: int) -> bool:
     """Check if a worker is idle (showing prompt, not typing).
 
-    A worker is idle if:
+    Uses the pane's @hc_state option when the worker has set it (see
+    set_pane_state). Otherwise a worker is idle if:
     - The Claude prompt (>) is visible in recent output
     - There's no active streaming/typing indicator
     """
-    import re
-    output = capture_pane(worker_id, lines=20)
+    snapshot = _resolve_session(None)
+    target = snapshot.pane_target(worker_id)
+    result = run_tmux_text(["display-message", "-p", "-t", target, f"#{{{_PANE_STATE_OPTION}}}"], check=False)
+    state = result.stdout.strip() if result.returncode == 0 else ""
+    if state in ("idle", "working"):
+        return state == "idle"
+
+    # With a watcher running, whichever of prompt and "Thinking" the pane
+    # printed last decides it
+    watcher = _get_watcher(snapshot)
+    recent = watcher.recent_output(worker_id) if watcher else None
+    if recent:
+        prompt_at = max((m.start() for m in _PROMPT_RE.finditer(recent)), default=-1)
+        thinking_at = recent.rfind(_THINKING_MARKER)
+        if prompt_at > thinking_at:
+            return True
+        if thinking_at > prompt_at:
+            return False
+
+    output = capture_pane(worker_id, lines=20, snapshot=snapshot)
 
     # Look for Claude's input prompt: a line that is just ">" with optional whitespace
     # This appears when Claude is waiting for input
-    if re.search(r'^\s*>\s*$', output, re.MULTILINE):
+    if _PROMPT_RE.search(output):
         return True
 
     # Check for "Thinking" indicator which means still processing
-    if '∴ Thinking' in output or '∴ Thinking…' in output:
+    if _THINKING_MARKER in output:
         return False
 
     return False
 
 
-def clear_worker(worker_id: int, session_name: Optional[str] = None) -> None:
+def clear_worker(
+    worker_id: int,
+    session_name: Optional[str] = None,
+    snapshot: Optional[SessionSnapshot] = None,
+) -> None:
     """Clear a worker's context."""
-    send_to_worker(worker_id, "/clear", session_name)
+    # Same as clear_all_workers: a cleared worker has no task
+    send_to_worker(worker_id, "/clear", session_name, snapshot, state="idle")
 
 
-def clear_all_workers(session_name: Optional[str] = None) -> None:
-    """Clear all workers' contexts."""
-    session = session_name or get_active_session()
-    session_info = get_session_info(session) if session else None
+def clear_all_workers(
+    session_name: Optional[str] = None,
+    snapshot: Optional[SessionSnapshot] = None,
+) -> None:
+    """Clear all workers' contexts.
 
-    if session_info:
-        num_workers = session_info.get("num_workers", 6)
-    else:
-        config = load_config()
-        num_workers = config["default_workers"]
+    Panes don't share input, so there's no need to pace the clears: every
+    pane gets its /clear in one tmux invocation and its Enter in another.
+    """
+    snapshot = snapshot or _resolve_session(session_name)
+    targets = [get_pane_target(i, snapshot=snapshot) for i in range(snapshot.num_workers)]
 
-    for i in range(num_workers):
-        clear_worker(i, session_name)
-        time.sleep(0.1)  # Small delay between clears
+    run_tmux_chain([["send-keys", "-t", target, "-l", "--", "/clear"] for target in targets])
+    # A cleared worker has no task, and no `hyperclaude done` will follow to
+    # reset the state
+    _submit_panes(targets, [_pane_state_command(target, "idle") for target in targets])
 
 
-def get_swarm_status(session_name: Optional[str] = None) -> dict:
-    """Get status information for all workers."""
+def get_swarm_status(
+    session_name: Optional[str] = None,
+    snapshot: Optional[SessionSnapshot] = None,
+) -> dict:
+    """Get status information for all workers.
+
+    Panes whose process has exited are reported as "dead" without being
+    captured.
+    """
     from .config import get_worker_state
 
-    session = session_name or get_active_session()
-    session_info = get_session_info(session) if session else None
+    snapshot = snapshot or _resolve_session(session_name)
 
-    if session_info:
-        num_workers = session_info.get("num_workers", 6)
-    else:
-        config = load_config()
-        num_workers = config["default_workers"]
+    # One list-panes call covers every pane's liveness and self-reported state
+    panes = {
+        pane["index"]: pane
+        for pane in list_pane_metadata(snapshot.tmux_session, snapshot.tmux_window)
+    }
 
     status = {}
-    for i in range(num_workers):
-        tokens = get_worker_tokens(i, session_name)
-        worker_state = get_worker_state(i)
+    working = set()
+    to_poll = []
+    for i in range(snapshot.num_workers):
+        pane = panes.get(i)
+        if pane is not None and pane["dead"]:
+            # Nothing to capture from a pane whose process has exited
+            status[i] = {"tokens": None, "state": "dead"}
+            continue
+
+        if get_worker_state(i) == "WORKING" or (pane is not None and pane["state"] == "working"):
+            working.add(i)
+        to_poll.append(i)
+
+    # Workers a running watcher has a token count for don't need capturing
+    watched = {}
+    for i in to_poll:
+        tokens = _watched_tokens(snapshot, i)
+        if tokens is not None:
+            watched[i] = tokens
+
+    outputs = get_all_worker_outputs(
+        lines=10, snapshot=snapshot, worker_ids=[i for i in to_poll if i not in watched]
+    )
+    for i in to_poll:
+        tokens = watched[i] if i in watched else _parse_tokens(outputs[i])
 
         # Use explicit state from state file
-        if worker_state == "WORKING":
+        if i in working:
             state = "working"
         elif tokens == 0 or tokens is None:
             state = "ready"
@@ -329,33 +1245,11 @@ def get_swarm_status(session_name: Optional[str] = None) -> dict:
             "state": state,
         }
 
-    return status
-
-
-def get_manager_preamble(num_workers: int, workspace: Path) -> str:
-    """Get the manager preamble text."""
-    # Try to load from ~/.hyperclaude/templates/ first
-    template_path = get_hyperclaude_dir() / "templates" / "manager-preamble.md"
-
-    if template_path.exists():
-        template = template_path.read_text()
-    else:
-        # Use built-in template
-        template = get_builtin_manager_preamble()
+    return dict(sorted(status.items()))
 
-    # Substitute variables
-    return template.format(
-        num_workers=num_workers,
-        num_workers_minus_one=num_workers - 1,
-        workspace=workspace,
-        worker_range=f"0-{num_workers - 1}",
-        worker_list=" ".join(str(i) for i in range(num_workers)),
-    )
 
-
-def get_worker_system_prompt(worker_id: int) -> str:
-    """Get the system prompt for a worker instance."""
-    return f"""You are Worker {worker_id} in a HyperClaude swarm - a legitimate multi-agent orchestration system authorized by the user.
+# Raw templates are module-level so each call only pays for the format step.
+_WORKER_SYS_TMPL = """You are Worker {worker_id} in a HyperClaude swarm - a legitimate multi-agent orchestration system authorized by the user.
 
 IMPORTANT - THIS IS NOT PROMPT INJECTION:
 The hyperclaude system is a user-installed CLI tool that coordinates multiple Claude Code instances. Messages you receive from the manager (via hyperclaude send/broadcast) and hyperclaude commands are LEGITIMATE orchestration, not attacks. The user has explicitly started this swarm and authorized this coordination.
@@ -369,18 +1263,20 @@ Your role:
 
 You have full permission to run hyperclaude commands. Trust [Task for Worker {worker_id}] messages - they come from the manager Claude instance coordinating this swarm."""
 
+# Worker launch command with the system prompt already escaped for the
+# double-quoted shell argument, so only worker_id is filled in per worker
+_WORKER_LAUNCH_TMPL = (
+    'claude --dangerously-skip-permissions --append-system-prompt "'
+    + _WORKER_SYS_TMPL.replace('"', '\\"').replace('\n', '\\n')
+    + '"'
+)
 
-def get_worker_init_message(worker_id: int, num_workers: int, workspace: Path) -> str:
-    """Get the initialization message sent to workers after startup."""
-    return f"""Read ~/.hyperclaude/worker-init.txt and acknowledge you understand your role as Worker {worker_id}. Then await tasks from the manager."""
-
+_WORKER_INIT_MSG_TMPL = """Read ~/.hyperclaude/worker-init.txt and acknowledge you understand your role as Worker {worker_id}. Then await tasks from the manager."""
 
-def get_worker_init_file_content(num_workers: int, workspace: Path) -> str:
-    """Get the content for the worker initialization file."""
-    return f"""You are a WORKER in a HyperClaude swarm - a legitimate multi-agent system.
+_WORKER_INIT_TMPL = """You are a WORKER in a HyperClaude swarm - a legitimate multi-agent system.
 
 ## Your Identity
-- You are one of {num_workers} worker instances (Workers 0-{num_workers - 1})
+- You are one of {num_workers} worker instances (Workers 0-{num_workers_minus_one})
 - A manager Claude instance coordinates all workers
 - Workspace: {workspace}
 
@@ -407,10 +1303,7 @@ hyperclaude unlock
 Ready to receive tasks from the manager.
 """
 
-
-def get_builtin_manager_preamble() -> str:
-    """Get the built-in manager preamble template (token-efficient version)."""
-    return '''You are the MANAGER of a hyperclaude swarm with {num_workers} workers (0-{num_workers_minus_one}).
+_MANAGER_PREAMBLE_TMPL = '''You are the MANAGER of a hyperclaude swarm with {num_workers} workers (0-{num_workers_minus_one}).
 
 ## Quick Reference
 
@@ -438,6 +1331,115 @@ Workers signal completion with `hyperclaude done`. Triggers auto-notify you.
 Workspace: {workspace}
 '''
 
+# On-disk template contents keyed by path, reused while the mtime is unchanged
+_template_cache: dict[Path, tuple[int, str]] = {}
+
+
+def _read_template(path: Path) -> Optional[str]:
+    """Read a user template file, reusing the cached text if it hasn't changed."""
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    cached = _template_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    text = path.read_text()
+    _template_cache[path] = (mtime, text)
+    return text
+
+
+def get_manager_preamble(num_workers: int, workspace: Path) -> str:
+    """Get the manager preamble text."""
+    # Try to load from ~/.hyperclaude/templates/ first, else use built-in template
+    template_path = get_hyperclaude_dir() / "templates" / "manager-preamble.md"
+    template = _read_template(template_path) or get_builtin_manager_preamble()
+    return _format_manager_preamble(template, num_workers, workspace)
+
+
+@functools.lru_cache(maxsize=8)
+def _format_manager_preamble(template: str, num_workers: int, workspace: Path) -> str:
+    """Substitute variables into a manager preamble template.
+
+    Keyed on the template text itself, so an edited template file is
+    formatted afresh; both template sources hand back the same str object
+    while unchanged, whose hash Python caches.
+    """
+    return template.format(
+        num_workers=num_workers,
+        num_workers_minus_one=num_workers - 1,
+        workspace=workspace,
+        worker_range=f"0-{num_workers - 1}",
+        worker_list=" ".join(str(i) for i in range(num_workers)),
+    )
+
+
+def get_worker_system_prompt(worker_id: int) -> str:
+    """Get the system prompt for a worker instance."""
+    return _WORKER_SYS_TMPL.format(worker_id=worker_id)
+
+
+def get_worker_launch_command(worker_id: int) -> str:
+    """Get the shell command that starts Claude in a worker pane."""
+    return _WORKER_LAUNCH_TMPL.format(worker_id=worker_id)
+
+
+def get_worker_init_message(worker_id: int, num_workers: int, workspace: Path) -> str:
+    """Get the initialization message sent to workers after startup."""
+    return _WORKER_INIT_MSG_TMPL.format(worker_id=worker_id)
+
+
+def get_worker_init_file_content(num_workers: int, workspace: Path) -> str:
+    """Get the content for the worker initialization file."""
+    return _WORKER_INIT_TMPL.format(
+        num_workers=num_workers,
+        num_workers_minus_one=num_workers - 1,
+        workspace=workspace,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_builtin_manager_preamble() -> str:
+    """Get the built-in manager preamble template (token-efficient version)."""
+    return _MANAGER_PREAMBLE_TMPL
+
+
+def _write_if_changed(path: Path, content: str) -> bool:
+    """Atomically write content to path, skipping the write if it's unchanged.
+
+    Returns True if the file was written.
+    """
+    data = content.encode()
+    try:
+        # A size mismatch settles it without reading the old file
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+
+    atomic_write_bytes(path, data)
+    return True
+
+
+# session-closed only fires as a global hook. A fixed array slot makes
+# installing it idempotent and leaves any other session-closed hooks alone.
+_LOCK_CLEANUP_HOOK = "session-closed[87]"
+
+
+def install_lock_cleanup_hook() -> None:
+    """Have tmux delete a session's locks file when the session closes.
+
+    The hook runs for every session on the server; for sessions that aren't
+    hyperclaude's the locks path doesn't exist and rm does nothing.
+    """
+    from .protocols import LOCKS_FILE
+
+    sessions_dir = shlex.quote(str(get_sessions_dir()))
+    cleanup = f"rm -f {sessions_dir}/#{{q:hook_session_name}}/locks/{LOCKS_FILE}"
+    run_tmux(["set-hook", "-g", _LOCK_CLEANUP_HOOK, f"run-shell {_control_quote(cleanup)}"], check=False)
+
 
 def start_swarm(
     workspace: Path,
@@ -474,6 +1476,7 @@ def start_swarm(
 
     # Register this session
     register_session(session, workspace, num_workers)
+    _resolve_session_cached.cache_clear()
 
     # Kill existing session if any
     run_tmux(["kill-session", "-t", session], check=False)
@@ -495,29 +1498,44 @@ def start_swarm(
     run_tmux(["set-window-option", "-t", f"{session}:{window}", "main-pane-width", "1"])
     run_tmux(["set-window-option", "-t", f"{session}:{window}", "main-pane-height", "1"])
 
+    # Clear a session's file locks whenever it closes, including when it's
+    # killed outside stop_swarm
+    install_lock_cleanup_hook()
+
+    # Send the rest of startup's tmux commands over one control-mode client
+    watch_session(session)
+
     # Create all worker panes sequentially
     # We start with pane 0 from new-session, need to create num_workers more panes
     # (num_workers - 1 additional workers + 1 manager)
     total_panes_to_create = num_workers  # workers 1..N-1 + manager
 
+    # All splits go out as one chained tmux invocation
+    split_commands = []
     for i in range(total_panes_to_create):
         # Apply tiled layout BEFORE each split to ensure there's room
-        run_tmux(["select-layout", "-t", f"{session}:{window}", "tiled"])
+        split_commands.append(["select-layout", "-t", f"{session}:{window}", "tiled"])
         # Split from the current pane
-        run_tmux(["split-window", "-t", f"{session}:{window}", "-h", "-c", str(workspace)])
+        split_commands.append(["split-window", "-t", f"{session}:{window}", "-h", "-c", str(workspace)])
 
     # Final tiled layout for even distribution
-    run_tmux(["select-layout", "-t", f"{session}:{window}", "tiled"])
+    split_commands.append(["select-layout", "-t", f"{session}:{window}", "tiled"])
+    run_tmux_chain(split_commands)
 
-    # Start Claude in each worker pane
+    # Mirror every pane's output into a FIFO so readiness waits can sleep
+    # until a pane changes instead of re-capturing it on a timer
+    manager_pane = f"{session}:{window}.{num_workers}"
+    all_panes = [f"{session}:{window}.{i}" for i in range(num_workers)] + [manager_pane]
+    for pane in all_panes:
+        open_pane_fifo(pane)
+
+    # Start Claude in each worker pane (one tmux invocation per worker)
     for i in range(num_workers):
         pane = f"{session}:{window}.{i}"
-        run_tmux(["send-keys", "-t", pane, f"export HYPERCLAUDE_WORKER_ID={i}"])
-        run_tmux(["send-keys", "-t", pane, "Enter"])
-        worker_prompt = get_worker_system_prompt(i).replace('"', '\\"').replace('\n', '\\n')
-        run_tmux(["send-keys", "-t", pane,
-                  f'claude --dangerously-skip-permissions --append-system-prompt "{worker_prompt}"'])
-        run_tmux(["send-keys", "-t", pane, "Enter"])
+        run_tmux_chain([
+            ["send-keys", "-t", pane, f"export HYPERCLAUDE_WORKER_ID={i}", "Enter"],
+            ["send-keys", "-t", pane, get_worker_launch_command(i), "Enter"],
+        ])
 
     # Build manager command (no bypass - manager uses normal permissions)
     manager_cmd = "claude"
@@ -525,41 +1543,30 @@ def start_swarm(
         manager_cmd += " --continue"
 
     # Start manager Claude
-    manager_pane = f"{session}:{window}.{num_workers}"
-    run_tmux(["send-keys", "-t", manager_pane, manager_cmd])
-    run_tmux(["send-keys", "-t", manager_pane, "Enter"])
+    _send_message(manager_pane, manager_cmd)
 
     # Write worker init file (do this before waiting so it's ready)
     worker_init_file = get_hyperclaude_dir() / "worker-init.txt"
     worker_init_content = get_worker_init_file_content(num_workers, workspace)
-    worker_init_file.write_text(worker_init_content)
+    _write_if_changed(worker_init_file, worker_init_content)
 
     print(f"Waiting for {num_workers} workers + manager to initialize...")
 
-    # Parallel wait: check all panes in round-robin until all ready
-    # This is MUCH faster than sequential 30s waits per worker
-    all_panes = [f"{session}:{window}.{i}" for i in range(num_workers)] + [manager_pane]
-    ready_panes = set()
+    # Wait for every pane at once; each wait returns as soon as its pane's
+    # ready signal fires (or falls back to polling the pane)
     # Dynamic timeout: 3 seconds per worker, minimum 60 seconds
     max_wait = max(60, num_workers * 3)
-    start_time = time.time()
+    results = wait_for_panes_ready(all_panes, timeout=max_wait)
 
-    while len(ready_panes) < len(all_panes) and (time.time() - start_time) < max_wait:
-        for pane in all_panes:
-            if pane in ready_panes:
-                continue
-            result = run_tmux(["capture-pane", "-t", pane, "-p", "-S", "-5"], check=False)
-            if result.returncode == 0:
-                output = result.stdout
-                if re.search(r'^\s*>\s*$', output, re.MULTILINE) or 'tokens' in output:
-                    ready_panes.add(pane)
-                    idx = all_panes.index(pane)
-                    if idx < num_workers:
-                        print(f"  Worker {idx} ready")
-                    else:
-                        print(f"  Manager ready")
-        if len(ready_panes) < len(all_panes):
-            time.sleep(0.5)
+    ready_panes = set()
+    for idx, (pane, ready) in enumerate(zip(all_panes, results)):
+        if not ready:
+            continue
+        ready_panes.add(pane)
+        if idx < num_workers:
+            print(f"  Worker {idx} ready")
+        else:
+            print(f"  Manager ready")
 
     not_ready = len(all_panes) - len(ready_panes)
     if not_ready > 0:
@@ -567,33 +1574,41 @@ def start_swarm(
 
     # Clear all workers using batched commands (much faster for many workers)
     print("Clearing workers...")
+    worker_panes = all_panes[:num_workers]
+    arm_pane_ready_signals(worker_panes)
     clear_messages = [(i, "/clear") for i in range(num_workers)]
     batch_send_keys(session, window, clear_messages)
 
-    # Brief pause for clears to process
-    time.sleep(2)
+    # Wait for each worker to settle back at its prompt after clearing
+    wait_for_panes_ready(worker_panes, timeout=10)
 
     # Initialize all workers using batched commands
     print("Initializing workers...")
+    arm_pane_ready_signals(worker_panes)
     init_messages = [
         (i, get_worker_init_message(i, num_workers, workspace))
         for i in range(num_workers)
     ]
     batch_send_keys(session, window, init_messages)
 
-    # Brief pause then continue (workers will be ready when needed)
-    time.sleep(1)
+    # Continue as soon as every worker has picked up its init message
+    wait_for_panes_ready(worker_panes, timeout=10)
 
     # Inject manager preamble as first message
     preamble = get_manager_preamble(num_workers, workspace)
 
     # Write preamble to a temp file and send it
     preamble_file = get_hyperclaude_dir() / "manager-init.txt"
-    preamble_file.write_text(preamble)
+    _write_if_changed(preamble_file, preamble)
 
     # Send the preamble to manager
-    run_tmux(["send-keys", "-t", manager_pane, "Read ~/.hyperclaude/manager-init.txt and acknowledge you understand your role as swarm manager. Then await my instructions."])
-    run_tmux(["send-keys", "-t", manager_pane, "Enter"])
+    _send_message(manager_pane, "Read ~/.hyperclaude/manager-init.txt and acknowledge you understand your role as swarm manager. Then await my instructions.")
+
+    # Startup waits are done; stop mirroring pane output
+    close_pane_fifos()
+    watcher = _WATCHERS.pop(session, None)
+    if watcher is not None:
+        watcher.close()
 
     print(f"\nHyperClaude swarm started!")
     print(f"  Session: {session}")
@@ -613,22 +1628,19 @@ def stop_swarm(session_name: Optional[str] = None) -> None:
     Args:
         session_name: Name of session to stop (default: active session)
     """
-    from .config import get_session_locks_dir
-
     # Determine session
     session = session_name or get_active_session()
     if not session:
         config = load_config()
         session = config["tmux_session"]
 
-    # Kill the session
-    run_tmux(["kill-session", "-t", session], check=False)
+    watcher = _WATCHERS.pop(session, None)
+    if watcher is not None:
+        watcher.close()
 
-    # Clean up lock files for this session
-    locks_dir = get_session_locks_dir(session)
-    if locks_dir.exists():
-        for lock_file in locks_dir.glob("*.lock"):
-            lock_file.unlink()
+    # Kill the session (its session-closed hook clears the file locks)
+    run_tmux(["kill-session", "-t", session], check=False)
 
-    # Unregister the session
+    # Unregister the session (removes its directory, locks included)
     unregister_session(session)
+    _resolve_session_cached.cache_clear()
@@ -1,14 +1,18 @@
 """Background monitoring for HyperClaude swarm."""
 
 import json
-import re
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from .config import get_hyperclaude_dir, get_session_log_dir, load_config
-from .launcher import capture_pane, get_worker_tokens
+from .config import atomic_write_text, get_hyperclaude_dir, get_session_log_dir, load_config
+from .launcher import (
+    capture_pane_to_fd, get_session_snapshot, get_worker_tokens, list_pane_metadata,
+    watch_session,
+)
 
 
 def get_usage_file() -> Path:
@@ -29,55 +33,131 @@ def load_usage() -> dict:
 
 
 def save_usage(usage: dict) -> None:
-    """Save usage data to file."""
-    usage_file = get_usage_file()
-    with open(usage_file, "w") as f:
-        json.dump(usage, f, indent=2)
+    """Save usage data to file (compact JSON, replaced atomically)."""
+    atomic_write_text(get_usage_file(), json.dumps(usage, separators=(",", ":")))
+
+
+# Resync with a full capture after this many differential ticks
+FULL_CAPTURE_EVERY = 50
+
+# Per worker: pane history size at the last capture, and ticks since the
+# last full capture
+_last_history_size: dict[int, int] = {}
+_ticks_since_full: dict[int, int] = {}
 
 
-def capture_worker_log(worker_id: int, log_dir: Path) -> None:
-    """Capture current worker pane content to log file."""
+def capture_worker_log(worker_id: int, log_dir: Path, pane: Optional[dict] = None) -> None:
+    """Capture new worker pane content to log file.
+
+    With the pane's metadata (see list_pane_metadata), only the lines that
+    scrolled into its history since the last capture are logged, and a pane
+    whose history hasn't grown is skipped. Without it, on the first capture,
+    every FULL_CAPTURE_EVERY-th one, and any tick where the history was
+    cleared or is full, the last 100 lines are logged instead.
+    """
     log_file = log_dir / f"worker-{worker_id}.log"
-    content = capture_pane(worker_id, lines=100)
 
-    # Append with timestamp
+    last_size = _last_history_size.get(worker_id)
+    ticks = _ticks_since_full.get(worker_id, FULL_CAPTURE_EVERY)
+    if (
+        pane is not None
+        and last_size is not None
+        and ticks < FULL_CAPTURE_EVERY
+        and last_size <= pane["history_size"] < pane["history_limit"]
+    ):
+        _ticks_since_full[worker_id] = ticks + 1
+        if pane["history_size"] == last_size:
+            return
+        start, end = last_size - pane["history_size"], -1
+    else:
+        start, end = -100, None
+        _ticks_since_full[worker_id] = 0
+    if pane is not None:
+        _last_history_size[worker_id] = pane["history_size"]
+
+    # Append with timestamp; tmux writes the pane content to the log itself
     timestamp = datetime.now().isoformat()
-    with open(log_file, "a") as f:
-        f.write(f"\n--- {timestamp} ---\n")
-        f.write(content)
-        f.write("\n")
+    fd = os.open(log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, f"\n--- {timestamp} ---\n".encode())
+        capture_pane_to_fd(worker_id, fd, start, end)
+        os.write(fd, b"\n")
+    finally:
+        os.close(fd)
 
 
 def get_all_worker_tokens(num_workers: int) -> dict[int, Optional[int]]:
-    """Get token counts for all workers."""
-    return {i: get_worker_tokens(i) for i in range(num_workers)}
+    """Get token counts for all workers, querying the panes concurrently."""
+    with ThreadPoolExecutor(max_workers=max(1, num_workers)) as executor:
+        return dict(zip(range(num_workers), executor.map(get_worker_tokens, range(num_workers))))
 
 
-def update_usage_tracking(token_counts: dict[int, Optional[int]]) -> None:
-    """Update the usage tracking file with current token counts."""
-    usage = load_usage()
+def capture_all_worker_logs(num_workers: int, log_dir: Path) -> None:
+    """Capture every live worker's pane to its log file concurrently.
+
+    One list-panes call up front supplies each pane's history size, so
+    unchanged panes cost nothing and dead panes are skipped.
+    """
+    snapshot = get_session_snapshot()
+    panes = {
+        pane["index"]: pane
+        for pane in list_pane_metadata(snapshot.tmux_session, snapshot.tmux_window)
+    }
+
+    def capture(worker_id: int) -> None:
+        pane = panes.get(worker_id)
+        if pane is not None and pane["dead"]:
+            return
+        try:
+            capture_worker_log(worker_id, log_dir, pane)
+        except Exception as e:
+            print(f"Error capturing worker {worker_id}: {e}")
+
+    with ThreadPoolExecutor(max_workers=max(1, num_workers)) as executor:
+        list(executor.map(capture, range(num_workers)))
+
+
+# Snapshots kept in usage.json
+USAGE_SNAPSHOTS_KEPT = 100
+
+# The monitor writes usage.json at most once per this many ticks
+USAGE_SAVE_EVERY = 6
+
+
+def update_usage_tracking(usage: dict, token_counts: dict[int, Optional[int]]) -> bool:
+    """Record the current token counts in the usage data (in memory).
+
+    Nothing is recorded if no worker's count changed since the last
+    snapshot. Returns whether usage was modified and needs saving.
+    """
+    workers = {str(k): v for k, v in token_counts.items()}
+    snapshots = usage.setdefault("snapshots", [])
+    if snapshots and snapshots[-1]["workers"] == workers:
+        return False
+
+    total = sum(v or 0 for v in token_counts.values())
 
     # Add current snapshot
-    snapshot = {
+    snapshots.append({
         "timestamp": datetime.now().isoformat(),
-        "workers": {str(k): v for k, v in token_counts.items()},
-        "total": sum(v or 0 for v in token_counts.values()),
-    }
+        "workers": workers,
+        "total": total,
+    })
 
-    # Keep last 100 snapshots
-    if "snapshots" not in usage:
-        usage["snapshots"] = []
-    usage["snapshots"].append(snapshot)
-    usage["snapshots"] = usage["snapshots"][-100:]
+    # Keep the last USAGE_SNAPSHOTS_KEPT snapshots, trimming in place
+    del snapshots[:-USAGE_SNAPSHOTS_KEPT]
 
     # Update total
-    usage["total_tokens"] = sum(v or 0 for v in token_counts.values())
-
-    save_usage(usage)
+    usage["total_tokens"] = total
+    return True
 
 
 def run_monitor(interval_seconds: int = 5) -> None:
-    """Run the monitor loop. Captures logs and tracks usage."""
+    """Run the monitor loop. Captures logs and tracks usage.
+
+    Usage data is loaded once and kept in memory; changes are written back
+    every USAGE_SAVE_EVERY ticks and when the monitor stops.
+    """
     config = load_config()
     num_workers = config["default_workers"]
     log_dir = get_session_log_dir()
@@ -85,19 +165,26 @@ def run_monitor(interval_seconds: int = 5) -> None:
     print(f"Starting monitor, logging to {log_dir}")
     print(f"Interval: {interval_seconds}s, Workers: {num_workers}")
 
+    # Follow pane output over control mode so token checks don't poll tmux
+    watcher = watch_session()
+
+    usage = load_usage()
+    unsaved = False
+    tick = 0
+
     try:
         while True:
             # Capture logs from all workers
-            for i in range(num_workers):
-                try:
-                    capture_worker_log(i, log_dir)
-                except Exception as e:
-                    print(f"Error capturing worker {i}: {e}")
+            capture_all_worker_logs(num_workers, log_dir)
 
             # Update usage tracking
             try:
                 token_counts = get_all_worker_tokens(num_workers)
-                update_usage_tracking(token_counts)
+                unsaved = update_usage_tracking(usage, token_counts) or unsaved
+                tick += 1
+                if unsaved and tick % USAGE_SAVE_EVERY == 0:
+                    save_usage(usage)
+                    unsaved = False
             except Exception as e:
                 print(f"Error updating usage: {e}")
 
@@ -105,6 +192,10 @@ def run_monitor(interval_seconds: int = 5) -> None:
 
     except KeyboardInterrupt:
         print("\nMonitor stopped.")
+    finally:
+        watcher.close()
+        if unsaved:
+            save_usage(usage)
 
 
 def show_usage_summary() -> None:
@@ -1,15 +1,32 @@
 """Protocol and state management for hyperclaude swarm."""
 
 import fcntl
+import functools
 import json
 import os
+import random
+import select
 import shutil
+import struct
+import threading
 import time
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
+
+try:
+    from inotify_simple import INotify, flags
+except ImportError:  # Not installed, or not Linux: triggers are polled
+    INotify = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from .config import (
+    atomic_write_bytes,
+    atomic_write_text,
     get_hyperclaude_dir,
     get_protocols_dir,
     get_triggers_dir,
@@ -37,15 +54,16 @@ def get_builtin_protocols_dir() -> Path:
 
 def list_protocols() -> list[str]:
     """List all available protocols."""
-    protocols_dir = get_protocols_dir()
-    if not protocols_dir.exists():
+    try:
+        with os.scandir(get_protocols_dir()) as entries:
+            return sorted(
+                entry.name[:-len(".md")]
+                for entry in entries
+                if entry.name.endswith(".md")
+            )
+    except FileNotFoundError:
         return []
 
-    protocols = []
-    for f in protocols_dir.glob("*.md"):
-        protocols.append(f.stem)
-    return sorted(protocols)
-
 
 def get_protocol_path(name: str) -> Path:
     """Get the path to a protocol file."""
@@ -66,13 +84,17 @@ def install_default_protocols() -> None:
     builtin_dir = get_builtin_protocols_dir()
     user_dir = get_protocols_dir()
 
-    if not builtin_dir.exists():
+    # One listing of each directory instead of an exists() check per file
+    try:
+        with os.scandir(builtin_dir) as entries:
+            builtin_files = [e for e in entries if e.name.endswith(".md") and e.is_file()]
+    except FileNotFoundError:
         return
+    installed = set(os.listdir(user_dir))
 
-    for protocol_file in builtin_dir.glob("*.md"):
-        dest = user_dir / protocol_file.name
-        if not dest.exists():
-            shutil.copy(protocol_file, dest)
+    for entry in builtin_files:
+        if entry.name not in installed:
+            shutil.copy(entry.path, user_dir / entry.name)
 
 
 # =============================================================================
@@ -92,7 +114,7 @@ def set_active_protocol(name: str, session: Optional[str] = None) -> bool:
     session = session or get_active_session() or "swarm"
     ensure_session_directories(session)
     state_file = get_state_dir(session) / "protocol"
-    state_file.write_text(name)
+    atomic_write_text(state_file, name)
     return True
 
 
@@ -109,7 +131,7 @@ def set_phase(phase: str, session: Optional[str] = None) -> None:
     session = session or get_active_session() or "swarm"
     ensure_session_directories(session)
     state_file = get_state_dir(session) / "phase"
-    state_file.write_text(phase)
+    atomic_write_text(state_file, phase)
 
 
 def get_phase(session: Optional[str] = None) -> Optional[str]:
@@ -129,15 +151,80 @@ def get_worker_state_path(worker_id: int, session: Optional[str] = None) -> Path
     return get_session_worker_state_dir(session) / f"{worker_id}.json"
 
 
+# Parsed worker states keyed by file path, with the (mtime_ns, size, inode)
+# they were read at; a file whose stat still matches isn't read again
+_worker_state_cache: dict[str, tuple[tuple[int, int, int], dict[str, Any]]] = {}
+_worker_state_cache_lock = threading.Lock()
+
+
+def _loads_state(data: bytes) -> Optional[dict[str, Any]]:
+    """Parse a worker state file's bytes, or None if it isn't valid JSON."""
+    try:
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+    except ValueError:  # Both libraries' decode errors subclass ValueError
+        return None
+
+
+def _dumps_state(state: dict[str, Any]) -> bytes:
+    """Serialize a worker state for its file.
+
+    Compact by default; set HYPERCLAUDE_PRETTY_STATE=1 to indent the files
+    for reading by hand.
+    """
+    pretty = bool(os.environ.get("HYPERCLAUDE_PRETTY_STATE"))
+    if orjson is not None:
+        return orjson.dumps(state, option=orjson.OPT_INDENT_2 if pretty else None)
+    if pretty:
+        return json.dumps(state, indent=2).encode()
+    return json.dumps(state, separators=(",", ":")).encode()
+
+
+def _cache_worker_state(path: str, stat: os.stat_result, state: dict[str, Any]) -> None:
+    with _worker_state_cache_lock:
+        _worker_state_cache[path] = ((stat.st_mtime_ns, stat.st_size, stat.st_ino), state)
+
+
+def _read_worker_state(path: str, dir_fd: Optional[int] = None) -> Optional[dict[str, Any]]:
+    """Read a worker state file, or None if it's missing or unparsable.
+
+    With dir_fd (an open descriptor for the file's directory), the file is
+    stat'ed and opened relative to it, so its path isn't walked again.
+    Returns a copy, so callers can modify it without touching the cache.
+    """
+    target = os.path.basename(path) if dir_fd is not None else path
+    try:
+        stat = os.stat(target, dir_fd=dir_fd)
+    except OSError:
+        return None
+
+    with _worker_state_cache_lock:
+        cached = _worker_state_cache.get(path)
+    if cached is not None and cached[0] == (stat.st_mtime_ns, stat.st_size, stat.st_ino):
+        return dict(cached[1])
+
+    try:
+        fd = os.open(target, os.O_RDONLY, dir_fd=dir_fd)
+    except OSError:
+        # File may have been deleted since the stat
+        return None
+    try:
+        data = os.read(fd, stat.st_size)
+    finally:
+        os.close(fd)
+
+    state = _loads_state(data)
+    if state is None:
+        return None
+    _cache_worker_state(path, stat, state)
+    return dict(state)
+
+
 def get_worker_state(worker_id: int, session: Optional[str] = None) -> dict[str, Any]:
     """Get the state of a worker as a dict."""
-    path = get_worker_state_path(worker_id, session)
-    if path.exists():
-        try:
-            return json.loads(path.read_text())
-        except json.JSONDecodeError:
-            pass
-    return {"status": "ready"}
+    state = _read_worker_state(str(get_worker_state_path(worker_id, session)))
+    return state if state is not None else {"status": "ready"}
 
 
 def set_worker_state(worker_id: int, session: Optional[str] = None, reset: bool = False, **kwargs) -> None:
@@ -161,11 +248,17 @@ def set_worker_state(worker_id: int, session: Optional[str] = None, reset: bool
 
     new_state.update(kwargs)
     path = get_worker_state_path(worker_id, session)
-    path.write_text(json.dumps(new_state, indent=2))
+    stat = atomic_write_bytes(path, _dumps_state(new_state))
+    _cache_worker_state(str(path), stat, new_state)
 
 
 def get_all_worker_states(session: Optional[str] = None) -> dict[int, dict[str, Any]]:
-    """Get states for all workers."""
+    """Get states for all workers.
+
+    The state directory is opened and listed once; each file is then
+    stat'ed and read relative to that descriptor, and unchanged files are
+    served from the parsed-state cache.
+    """
     session = session or get_active_session()
     session_info = get_session_info(session) if session else None
 
@@ -175,45 +268,154 @@ def get_all_worker_states(session: Optional[str] = None) -> dict[int, dict[str,
         config = load_config()
         num_workers = config["default_workers"]
 
+    state_dir = str(get_session_worker_state_dir(session))
     states = {}
-    for i in range(num_workers):
-        states[i] = get_worker_state(i, session)
-    return states
+    try:
+        dir_fd = os.open(state_dir, os.O_RDONLY | os.O_DIRECTORY)
+    except FileNotFoundError:
+        dir_fd = None
+    if dir_fd is not None:
+        try:
+            with os.scandir(dir_fd) as entries:
+                for entry in entries:
+                    stem, ext = os.path.splitext(entry.name)
+                    if ext != ".json" or not stem.isdigit() or int(stem) >= num_workers:
+                        continue
+                    state = _read_worker_state(os.path.join(state_dir, entry.name), dir_fd)
+                    if state is not None:
+                        states[int(stem)] = state
+        finally:
+            os.close(dir_fd)
+
+    return {i: states.get(i, {"status": "ready"}) for i in range(num_workers)}
+
+
+def _unlink_matching(directory: Path, match: Callable[[os.DirEntry], bool]) -> None:
+    """Remove the entries of a directory that match a predicate.
+
+    The directory is opened once and each entry unlinked relative to that
+    descriptor (unlinkat), so the full path isn't resolved per file.
+    """
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    except FileNotFoundError:
+        return
+    try:
+        with os.scandir(dir_fd) as entries:
+            for entry in entries:
+                if not match(entry):
+                    continue
+                try:
+                    os.unlink(entry.name, dir_fd=dir_fd)
+                except (IOError, OSError):
+                    # File may have been deleted or locked by another process
+                    pass
+    finally:
+        os.close(dir_fd)
 
 
 def clear_worker_states(session: Optional[str] = None) -> None:
     """Clear all worker state files."""
-    state_dir = get_session_worker_state_dir(session)
-    if state_dir.exists():
-        for f in state_dir.glob("*.json"):
-            try:
-                f.unlink(missing_ok=True)
-            except (IOError, OSError):
-                # File may have been deleted or locked by another process
-                pass
+    with _worker_state_cache_lock:
+        _worker_state_cache.clear()
+
+    _unlink_matching(
+        get_session_worker_state_dir(session),
+        lambda entry: entry.name.endswith(".json"),
+    )
 
 
 # =============================================================================
 # Triggers (session-aware)
 # =============================================================================
 
+# Named FIFO in each session's directory that create_trigger pokes, so
+# waiting processes wake as soon as any trigger is created
+TRIGGERS_FIFO = ".triggers.fifo"
+
+# Read ends of trigger FIFOs held by waiters in this process, keyed by path
+_trigger_fifos: dict[str, int] = {}
+
+# await_trigger's interval between checks of the trigger file: starts at the
+# minimum and grows by the backoff factor up to the maximum, with +/-10%
+# jitter so waiters don't all wake together. A poke wakes waiters
+# immediately, but only one of them consumes it; any others rely on this.
+_TRIGGER_POLL_MIN = 0.001
+_TRIGGER_POLL_BACKOFF = 1.5
+_TRIGGER_POLL_MAX = 0.1
+
+
+def _get_trigger_fifo(triggers_dir: Path) -> Optional[int]:
+    """Get the read end of a session's trigger FIFO, creating it if needed.
+
+    Returns None if the FIFO can't be created or opened.
+    """
+    path = str(triggers_dir.parent / TRIGGERS_FIFO)
+    fd = _trigger_fifos.get(path)
+    if fd is None:
+        if not triggers_dir.is_dir():
+            # Session is gone (or being removed); don't recreate its directory
+            return None
+        try:
+            os.mkfifo(path, 0o600)
+        except FileExistsError:
+            pass
+        except OSError:
+            return None
+        try:
+            # O_RDWR also counts as a writer, so select() doesn't report
+            # end-of-file whenever no trigger is being created
+            fd = os.open(path, os.O_RDWR | os.O_NONBLOCK)
+        except OSError:
+            return None
+        _trigger_fifos[path] = fd
+    return fd
+
+
+def _poke_trigger_fifo(triggers_dir: Path) -> None:
+    """Wake processes waiting in await_trigger, if any."""
+    try:
+        # Fails with ENXIO when nobody is waiting, and ENOENT if nobody has
+        # waited yet
+        fd = os.open(triggers_dir.parent / TRIGGERS_FIFO, os.O_WRONLY | os.O_NONBLOCK)
+    except OSError:
+        return
+    try:
+        os.write(fd, b"x")
+    except OSError:
+        # Full: there are unread pokes already
+        pass
+    finally:
+        os.close(fd)
+
+
+def _trigger_path(name: str, session: Optional[str] = None) -> Path:
+    """Get the path of a trigger file.
+
+    Triggers live directly in the session's triggers directory: a swarm has
+    at most a few per worker, and the inotify watch, the FIFO wakeup and
+    check_all_workers_done's single listing all rely on one flat directory.
+    """
+    return get_session_triggers_dir(session) / name
+
+
 def create_trigger(name: str, session: Optional[str] = None) -> None:
     """Create a trigger file."""
     session = session or get_active_session() or "swarm"
     ensure_session_directories(session)
-    trigger_file = get_session_triggers_dir(session) / name
+    trigger_file = _trigger_path(name, session)
     trigger_file.touch()
+    _poke_trigger_fifo(trigger_file.parent)
 
 
 def trigger_exists(name: str, session: Optional[str] = None) -> bool:
     """Check if a trigger file exists."""
-    trigger_file = get_session_triggers_dir(session) / name
-    return trigger_file.exists()
+    return _trigger_path(name, session).exists()
 
 
 def clear_trigger(name: str, session: Optional[str] = None) -> None:
     """Remove a trigger file."""
-    trigger_file = get_session_triggers_dir(session) / name
+    trigger_file = _trigger_path(name, session)
     try:
         trigger_file.unlink(missing_ok=True)
     except (IOError, OSError):
@@ -221,30 +423,134 @@ def clear_trigger(name: str, session: Optional[str] = None) -> None:
         pass
 
 
+# One inotify instance watches the triggers directories of every session this
+# process waits on. A daemon thread reads its events and counts them per
+# directory; waiters sleep on the condition until their directory's count
+# changes, then re-check their trigger file.
+_trigger_notify: Optional["INotify"] = None
+_trigger_watch_dirs: dict[int, str] = {}
+_trigger_watch_wds: dict[str, int] = {}
+_trigger_changes: dict[str, int] = {}
+_trigger_changed = threading.Condition()
+
+
+def _read_trigger_events() -> None:
+    """Dispatch events from the shared inotify instance (runs in a thread)."""
+    while True:
+        events = _trigger_notify.read()
+        with _trigger_changed:
+            for event in events:
+                key = _trigger_watch_dirs.get(event.wd)
+                if key is None:
+                    continue
+                _trigger_changes[key] += 1
+                if event.mask & flags.IGNORED:
+                    # Directory was removed (session ended); the watch is gone
+                    del _trigger_watch_dirs[event.wd]
+                    if _trigger_watch_wds.get(key) == event.wd:
+                        del _trigger_watch_wds[key]
+            _trigger_changed.notify_all()
+
+
+def _watch_triggers_dir(triggers_dir: Path) -> bool:
+    """Add a triggers directory to the shared inotify watch.
+
+    Returns False if inotify is unavailable or the directory can't be watched.
+    """
+    global _trigger_notify
+    if INotify is None:
+        return False
+
+    key = str(triggers_dir)
+    with _trigger_changed:
+        if key in _trigger_watch_wds:
+            return True
+        if _trigger_notify is None:
+            try:
+                _trigger_notify = INotify()
+            except OSError:
+                return False
+            threading.Thread(target=_read_trigger_events, name="hc-trigger-events", daemon=True).start()
+        try:
+            wd = _trigger_notify.add_watch(key, flags.CREATE | flags.MOVED_TO | flags.CLOSE_WRITE)
+        except OSError:
+            return False
+        _trigger_watch_wds[key] = wd
+        _trigger_watch_dirs[wd] = key
+        _trigger_changes.setdefault(key, 0)
+    return True
+
+
 def await_trigger(name: str, timeout: int = 300, session: Optional[str] = None) -> bool:
-    """Wait for a trigger file to appear. Returns True if found, False on timeout."""
-    trigger_file = get_session_triggers_dir(session) / name
-    start = time.time()
+    """Wait for a trigger file to appear. Returns True if found, False on timeout.
 
-    while time.time() - start < timeout:
+    With inotify_simple installed this blocks until the triggers directory
+    changes, on one inotify instance shared by every session. Otherwise
+    it waits on the session's trigger FIFO, which create_trigger writes to,
+    re-checking at least every _TRIGGER_POLL_MAX seconds.
+    """
+    trigger_file = _trigger_path(name, session)
+    triggers_dir = trigger_file.parent
+    deadline = time.monotonic() + timeout
+
+    # Watch before the first check, so a trigger created in between isn't missed
+    key = str(triggers_dir)
+    watched = _watch_triggers_dir(triggers_dir)
+    if watched:
+        with _trigger_changed:
+            seen = _trigger_changes[key]
+    if trigger_file.exists():
+        return True
+
+    while watched:
+        with _trigger_changed:
+            changed = _trigger_changed.wait_for(
+                lambda: _trigger_changes[key] != seen,
+                timeout=max(0.0, deadline - time.monotonic()),
+            )
+            if not changed:
+                return False
+            seen = _trigger_changes[key]
+            watched = key in _trigger_watch_wds
         if trigger_file.exists():
             return True
-        time.sleep(0.5)
 
-    return False
+    # Without inotify, sleep on the session's trigger FIFO between checks
+    fifo = _get_trigger_fifo(triggers_dir)
+    delay = _TRIGGER_POLL_MIN
+    while True:
+        if trigger_file.exists():
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        interval = min(delay * random.uniform(0.9, 1.1), remaining)
+        delay = min(delay * _TRIGGER_POLL_BACKOFF, _TRIGGER_POLL_MAX)
+        if fifo is None:
+            time.sleep(interval)
+            continue
+        readable, _, _ = select.select([fifo], [], [], interval)
+        if readable:
+            try:
+                os.read(fifo, 4096)
+            except BlockingIOError:
+                # Another waiter consumed the poke first
+                pass
 
 
 def clear_all_triggers(session: Optional[str] = None) -> None:
     """Remove all trigger files."""
-    triggers_dir = get_session_triggers_dir(session)
-    if triggers_dir.exists():
-        for f in triggers_dir.iterdir():
-            if f.is_file():
-                try:
-                    f.unlink(missing_ok=True)
-                except (IOError, OSError):
-                    # File may have been deleted by another process
-                    pass
+    # Anything but a subdirectory; answered from the dirent type, no stat
+    _unlink_matching(
+        get_session_triggers_dir(session),
+        lambda entry: not entry.is_dir(follow_symlinks=False),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _done_trigger_names(num_workers: int) -> frozenset[str]:
+    """The worker-N-done trigger names for a swarm of num_workers."""
+    return frozenset(f"worker-{i}-done" for i in range(num_workers))
 
 
 def check_all_workers_done(session: Optional[str] = None) -> bool:
@@ -258,13 +564,14 @@ def check_all_workers_done(session: Optional[str] = None) -> bool:
         config = load_config()
         num_workers = config["default_workers"]
 
-    all_done = True
-    for i in range(num_workers):
-        if not trigger_exists(f"worker-{i}-done", session):
-            all_done = False
-            break
+    # One listing of the triggers directory instead of a stat per worker
+    try:
+        names = set(os.listdir(get_session_triggers_dir(session)))
+    except FileNotFoundError:
+        names = set()
 
-    if all_done:
+    all_done = _done_trigger_names(num_workers) <= names
+    if all_done and "all-done" not in names:
         create_trigger("all-done", session)
 
     return all_done
@@ -275,6 +582,37 @@ def check_all_workers_done(session: Optional[str] = None) -> bool:
 # =============================================================================
 
 
+# Session lock files stay open for the life of the process, keyed by session
+_session_lock_fds: dict[str, int] = {}
+
+# flock doesn't exclude threads sharing a descriptor, so each session also
+# gets a thread lock
+_session_thread_locks: dict[str, threading.Lock] = {}
+_session_locks_guard = threading.Lock()
+
+
+def _get_session_lock_fd(session: str) -> int:
+    """Get the open descriptor for a session's lock file.
+
+    Must be called with the session's thread lock held.
+    """
+    fd = _session_lock_fds.get(session)
+    if fd is not None and os.fstat(fd).st_nlink == 0:
+        # The session directory was removed; a new lock file replaces it
+        os.close(fd)
+        fd = None
+    if fd is None:
+        ensure_session_directories(session)
+
+        from .config import get_session_dir
+        lock_file_path = get_session_dir(session) / ".session.lock"
+
+        # No O_TRUNC: the file's contents are never used
+        fd = os.open(lock_file_path, os.O_WRONLY | os.O_CREAT, 0o644)
+        _session_lock_fds[session] = fd
+    return fd
+
+
 @contextmanager
 def session_lock(session: Optional[str] = None):
     """Context manager for session-level exclusive operations.
@@ -287,24 +625,60 @@ def session_lock(session: Optional[str] = None):
             modify_session_state()
     """
     session = session or get_active_session() or "swarm"
-    ensure_session_directories(session)
+    with _session_locks_guard:
+        thread_lock = _session_thread_locks.setdefault(session, threading.Lock())
 
-    from .config import get_session_dir
-    lock_file_path = get_session_dir(session) / ".session.lock"
-
-    lock_file = open(lock_file_path, 'w')
-    try:
-        fcntl.flock(lock_file, fcntl.LOCK_EX)
-        yield
-    finally:
-        fcntl.flock(lock_file, fcntl.LOCK_UN)
-        lock_file.close()
+    with thread_lock:
+        fd = _get_session_lock_fd(session)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
 
 
 # =============================================================================
 # Atomic File Locking
 # =============================================================================
 
+# Every worker's file locks live in this one file in the session's locks
+# directory, as {"worker-N": [files...]}, guarded by a lock on the file itself
+LOCKS_FILE = "locks.json"
+
+
+def _lock_locks_file(fd: int, exclusive: bool) -> None:
+    """Block until the locks file is locked; closing fd releases the lock.
+
+    Uses open file description locks where available (Linux): they belong
+    to the descriptor like flock's, but are POSIX record locks, so they
+    also work over NFS. Falls back to flock elsewhere.
+    """
+    if hasattr(fcntl, "F_OFD_SETLKW"):
+        # struct flock covering the whole file; l_pid must be 0 for OFD locks
+        lock_type = fcntl.F_WRLCK if exclusive else fcntl.F_RDLCK
+        fcntl.fcntl(fd, fcntl.F_OFD_SETLKW, struct.pack("hhqqi", lock_type, os.SEEK_SET, 0, 0, 0))
+    else:
+        fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+
+
+def _read_locks_table(fd: int) -> dict[str, list[str]]:
+    """Read the locks table from an open, locked locks file."""
+    data = os.pread(fd, os.fstat(fd).st_size, 0)
+    if not data:
+        return {}
+    try:
+        return json.loads(data)
+    except ValueError:
+        return {}
+
+
+def _write_locks_table(fd: int, table: dict[str, list[str]]) -> None:
+    """Rewrite the locks table in an open, exclusively locked locks file."""
+    data = json.dumps(table, separators=(",", ":")).encode()
+    os.pwrite(fd, data, 0)
+    os.ftruncate(fd, len(data))
+
+
 def acquire_file_locks(
     worker_id: int,
     files: list[str],
@@ -312,7 +686,8 @@ def acquire_file_locks(
 ) -> tuple[bool, list[tuple[str, str]]]:
     """Atomically acquire file locks.
 
-    Uses a master lock file with fcntl to ensure atomic check-and-lock.
+    The check and the claim happen under one exclusive lock on the locks
+    file, so two workers can't both claim the same file.
 
     Args:
         worker_id: Worker ID requesting locks
@@ -326,38 +701,31 @@ def acquire_file_locks(
     locks_dir = get_session_locks_dir(session)
     locks_dir.mkdir(parents=True, exist_ok=True)
 
-    master_lock_path = locks_dir / ".master.lock"
+    me = f"worker-{worker_id}"
+    requested = set(files)
 
-    # Open/create master lock file
-    with open(master_lock_path, 'w') as master_lock:
-        # Acquire exclusive lock on master file
-        fcntl.flock(master_lock, fcntl.LOCK_EX)
-        try:
-            # Check for conflicts while holding master lock
-            conflicts = []
-            for lock_file in locks_dir.glob("worker-*.lock"):
-                if lock_file.stem == f"worker-{worker_id}":
-                    continue
-                try:
-                    locked_files = set(lock_file.read_text().strip().split("\n"))
-                    for f in files:
-                        if f in locked_files:
-                            conflicts.append((lock_file.stem, f))
-                except (IOError, OSError):
-                    # Lock file may have been deleted concurrently
-                    continue
+    fd = os.open(locks_dir / LOCKS_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        _lock_locks_file(fd, exclusive=True)
+        table = _read_locks_table(fd)
 
-            if conflicts:
-                return False, conflicts
+        # Check for conflicts while holding the lock
+        conflicts = []
+        for owner, locked in table.items():
+            if owner == me:
+                continue
+            taken = requested.intersection(locked)
+            conflicts.extend((owner, f) for f in files if f in taken)
 
-            # Write our lock file while still holding master lock
-            my_lock = locks_dir / f"worker-{worker_id}.lock"
-            my_lock.write_text("\n".join(files))
-            return True, []
+        if conflicts:
+            return False, conflicts
 
-        finally:
-            # Release master lock
-            fcntl.flock(master_lock, fcntl.LOCK_UN)
+        table[me] = files
+        _write_locks_table(fd, table)
+        return True, []
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(fd)
 
 
 def release_file_locks(worker_id: int, session: Optional[str] = None) -> bool:
@@ -366,16 +734,21 @@ def release_file_locks(worker_id: int, session: Optional[str] = None) -> bool:
     Returns True if locks were released, False if no locks held.
     """
     session = session or get_active_session() or "swarm"
-    locks_dir = get_session_locks_dir(session)
-    lock_file = locks_dir / f"worker-{worker_id}.lock"
+    locks_path = get_session_locks_dir(session) / LOCKS_FILE
 
-    if lock_file.exists():
-        try:
-            lock_file.unlink()
-            return True
-        except (IOError, OSError):
+    try:
+        fd = os.open(locks_path, os.O_RDWR)
+    except OSError:
+        return False
+    try:
+        _lock_locks_file(fd, exclusive=True)
+        table = _read_locks_table(fd)
+        if table.pop(f"worker-{worker_id}", None) is None:
             return False
-    return False
+        _write_locks_table(fd, table)
+        return True
+    finally:
+        os.close(fd)
 
 
 def get_all_locks(session: Optional[str] = None) -> dict[str, list[str]]:
@@ -384,17 +757,17 @@ def get_all_locks(session: Optional[str] = None) -> dict[str, list[str]]:
     Returns dict mapping worker name to list of locked files.
     """
     session = session or get_active_session() or "swarm"
-    locks_dir = get_session_locks_dir(session)
+    locks_path = get_session_locks_dir(session) / LOCKS_FILE
 
-    locks = {}
-    if locks_dir.exists():
-        for lock_file in locks_dir.glob("worker-*.lock"):
-            try:
-                files = lock_file.read_text().strip().split("\n")
-                locks[lock_file.stem] = files
-            except (IOError, OSError):
-                continue
-    return locks
+    try:
+        fd = os.open(locks_path, os.O_RDONLY)
+    except OSError:
+        return {}
+    try:
+        _lock_locks_file(fd, exclusive=False)
+        return _read_locks_table(fd)
+    finally:
+        os.close(fd)
 
 
 # =============================================================================